@@ -0,0 +1,51 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import ClaimsUser
+
+CLAIMS = ('username', 'role', 'is_staff', 'is_superuser')
+
+
+class RoleAccessToken(AccessToken):
+    """Access-токен с ролью и флагами пользователя в claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """Аутентификация без запроса к БД для токенов RoleAccessToken.
+
+    Токены без claims роли и запросы на запись обрабатываются как обычно:
+    пользователь загружается из БД и проверяется `is_active`.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is None or request.method in SAFE_METHODS:
+            return result
+        user, validated_token = result
+        if isinstance(user, ClaimsUser):
+            user = super().get_user(validated_token)
+        return user, validated_token
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in CLAIMS):
+            return super().get_user(validated_token)
+        return ClaimsUser(
+            id=validated_token[api_settings.USER_ID_CLAIM],
+            **{claim: validated_token[claim] for claim in CLAIMS},
+        )
+
+
+def load_user(user):
+    """Полный объект пользователя для представлений, которым он нужен."""
+    if isinstance(user, ClaimsUser):
+        return user.load()
+    return user
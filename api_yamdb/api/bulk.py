@@ -0,0 +1,216 @@
+from django.db import connections, router, transaction
+from django.db.models.sql import InsertQuery
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from api.cache import bump_version
+from reviews.models import Category, Genre, GenreTitle, Title
+
+
+def bulk_insert(model, objects, batch_size=500):
+    """bulk_create, после которого у объектов есть id.
+
+    SQLite в Django 3.2 не возвращает id из bulk_create, поэтому каждая
+    пачка вставляется одним INSERT ... RETURNING (SQLite 3.35+). Порядок
+    строк RETURNING не определён, но id внутри одного INSERT растут в
+    порядке VALUES, поэтому отсортированные id соответствуют объектам.
+    """
+    pk = model._meta.pk
+    fields = [field for field in model._meta.concrete_fields if field != pk]
+    connection = connections[router.db_for_write(model)]
+    batch_size = min(
+        batch_size, connection.ops.bulk_batch_size(fields, objects) or 1
+    )
+    returning = f' RETURNING {connection.ops.quote_name(pk.column)}'
+    with connection.cursor() as cursor:
+        for start in range(0, len(objects), batch_size):
+            batch = objects[start:start + batch_size]
+            query = InsertQuery(model)
+            query.insert_values(fields, batch)
+            for sql, params in query.get_compiler(
+                connection=connection
+            ).as_sql():
+                cursor.execute(sql + returning, params)
+                for obj, (value,) in zip(batch, sorted(cursor.fetchall())):
+                    obj.pk = value
+                    obj._state.adding = False
+                    obj._state.db = connection.alias
+    return objects
+
+
+class BulkUpsertMixin:
+    """POST массива в `<список>/`: создание и обновление массивом объектов.
+
+    Объект в теле запроса, как и раньше, создаёт один элемент. Ссылки всех
+    элементов проверяются пачкой в `get_bulk_context()`, корректные
+    элементы сохраняются одной транзакцией в `perform_bulk_upsert()`, а
+    ответ содержит результат по каждому элементу в порядке запроса.
+    """
+    bulk_serializer_class = None
+    bulk_max_items = 1000
+    bulk_scopes = ()
+
+    def get_bulk_context(self, items):
+        return self.get_serializer_context()
+
+    def get_bulk_key(self, data):
+        """Ключ элемента: два элемента с одним ключом в запросе — ошибка."""
+        return None
+
+    def get_bulk_scopes(self, results):
+        """Области кеша, версии которых сдвигает запись `results`."""
+        return self.bulk_scopes
+
+    def perform_bulk_upsert(self, items, context):
+        """Сохраняет элементы, возвращает результаты в том же порядке.
+
+        По умолчанию все элементы создаются.
+        """
+        model = self.get_queryset().model
+        created = bulk_insert(model, [model(**data) for data in items])
+        return [
+            {'status': status.HTTP_201_CREATED, 'id': obj.pk}
+            for obj in created
+        ]
+
+    def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_upsert(request)
+        return super().create(request, *args, **kwargs)
+
+    def bulk_upsert(self, request):
+        items = request.data
+        if not all(isinstance(item, dict) for item in items):
+            return Response(
+                {'detail': 'Ожидается массив объектов.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {'detail': f'Не больше {self.bulk_max_items} объектов '
+                           'за запрос.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        context = self.get_bulk_context(items)
+        results = [None] * len(items)
+        valid = []
+        keys = set()
+        for index, item in enumerate(items):
+            serializer = self.bulk_serializer_class(data=item, context=context)
+            if not serializer.is_valid():
+                results[index] = {
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'errors': serializer.errors,
+                }
+                continue
+            key = self.get_bulk_key(serializer.validated_data)
+            if key is not None and key in keys:
+                results[index] = {
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'errors': {api_settings.NON_FIELD_ERRORS_KEY: [
+                        'Объект повторяется в запросе.'
+                    ]},
+                }
+                continue
+            keys.add(key)
+            valid.append((index, serializer.validated_data))
+        if valid:
+            with transaction.atomic():
+                saved = self.perform_bulk_upsert(
+                    [data for _, data in valid], context
+                )
+                bump_version(*self.get_bulk_scopes(saved))
+            for (index, _), result in zip(valid, saved):
+                results[index] = result
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+class NamedBulkUpsertMixin(BulkUpsertMixin):
+    """Массовое создание и обновление категорий и жанров по slug."""
+
+    def get_bulk_key(self, data):
+        return data['slug']
+
+    def perform_bulk_upsert(self, items, context):
+        model = self.get_queryset().model
+        existing = model.objects.in_bulk(
+            [data['slug'] for data in items], field_name='slug'
+        )
+        created, updated, results = [], [], []
+        for data in items:
+            obj = existing.get(data['slug'])
+            if obj is None:
+                created.append(model(**data))
+                code = status.HTTP_201_CREATED
+            else:
+                obj.name = data['name']
+                updated.append(obj)
+                code = status.HTTP_200_OK
+            results.append({'status': code, 'slug': data['slug']})
+        model.objects.bulk_create(created)
+        model.objects.bulk_update(updated, ('name',))
+        return results
+
+
+def get_slugs(value):
+    values = value if isinstance(value, list) else [value]
+    return {slug for slug in values if isinstance(slug, str)}
+
+
+class TitleBulkUpsertMixin(BulkUpsertMixin):
+    """Массовое создание и обновление произведений вместе с жанрами."""
+
+    def get_bulk_context(self, items):
+        context = super().get_bulk_context(items)
+        genres, categories, ids = set(), set(), set()
+        for item in items:
+            genres |= get_slugs(item.get('genre'))
+            categories |= get_slugs(item.get('category'))
+            if str(item.get('id', '')).isdigit():
+                ids.add(int(item['id']))
+        context['preloaded'] = {
+            Genre: Genre.objects.in_bulk(genres, field_name='slug'),
+            Category: Category.objects.in_bulk(categories, field_name='slug'),
+            Title: Title.objects.in_bulk(ids),
+        }
+        return context
+
+    def get_bulk_key(self, data):
+        return data.get('id')
+
+    def get_bulk_scopes(self, results):
+        return (*super().get_bulk_scopes(results), *(
+            f'title:{result["id"]}' for result in results
+            if result['status'] == status.HTTP_200_OK
+        ))
+
+    def perform_bulk_upsert(self, items, context):
+        existing = context['preloaded'][Title]
+        created, updated, saved = [], [], []
+        for data in items:
+            data = dict(data)
+            genres = data.pop('genre')
+            title_id = data.pop('id', None)
+            if title_id is None:
+                title = Title(**data)
+                created.append(title)
+                code = status.HTTP_201_CREATED
+            else:
+                title = existing[title_id]
+                for field, value in data.items():
+                    setattr(title, field, value)
+                updated.append(title)
+                code = status.HTTP_200_OK
+            saved.append((title, code, dict.fromkeys(genres)))
+        bulk_insert(Title, created)
+        Title.objects.bulk_update(
+            updated, ('name', 'year', 'description', 'category')
+        )
+        GenreTitle.objects.filter(title__in=updated).delete()
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title=title, genre=genre)
+            for title, _, genres in saved
+            for genre in genres
+        )
+        return [{'status': code, 'id': title.id} for title, code, _ in saved]
@@ -0,0 +1,186 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.conf import settings
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def get_cache():
+    return caches[getattr(settings, 'API_CACHE_ALIAS', 'default')]
+
+
+def cache_is_shared():
+    """Видят ли все процессы API одни и те же версии данных.
+
+    LocMemCache у каждого процесса свой, поэтому версии в нём общие, только
+    если API обслуживает один процесс (настройка API_SINGLE_PROCESS).
+    DummyCache версий не хранит вовсе.
+    """
+    cache = get_cache()
+    if isinstance(cache, DummyCache):
+        return False
+    return getattr(settings, 'API_SINGLE_PROCESS', False) or not isinstance(
+        cache, LocMemCache
+    )
+
+
+def get_stamps(prefix, scopes):
+    """Значения счётчиков `prefix` для областей `scopes` за одно
+    обращение к кешу.
+
+    Отсутствующий счётчик (первое обращение или вытеснение) заводится от
+    текущего времени, чтобы не совпасть ни с одним прежним значением.
+    """
+    cache = get_cache()
+    keys = [f'{prefix}:{scope}' for scope in scopes]
+    stamps = cache.get_many(keys)
+    for key in keys:
+        if key not in stamps:
+            cache.add(key, time.time_ns(), timeout=None)
+            stamps[key] = cache.get(key)
+    return [stamps[key] for key in keys]
+
+
+def get_version(scope):
+    """Текущая версия данных области `scope`."""
+    return get_stamps('version', (scope,))[0]
+
+
+def bump_version(*scopes):
+    """Сдвигает версии областей после фиксации текущей транзакции."""
+
+    def bump():
+        cache = get_cache()
+        now = time.time_ns()
+        for scope in scopes:
+            key = f'version:{scope}'
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, now, timeout=None)
+        cache.set_many(
+            {f'modified:{scope}': now for scope in scopes}, timeout=None
+        )
+
+    transaction.on_commit(bump)
+
+
+class VersionedListCacheMixin:
+    """Кеширует ответы `list` по строке запроса и версии области.
+
+    Создание и удаление через вьюсет сдвигают версию, поэтому закешированный
+    ответ никогда не переживает изменение данных. Ссылки next/previous в
+    ответе абсолютные, поэтому ключ включает схему и хост запроса. Как и
+    валидаторы ConditionalGetMixin, кеш работает, только если версии общие
+    для всех процессов.
+    """
+    cache_scope = None
+    cache_timeout = 60 * 60
+    destroy_scopes = ()
+
+    def get_cache_scope(self):
+        return self.cache_scope or self.basename
+
+    def get_list_cache_key(self, request):
+        query = urlencode(sorted(request.query_params.items()))
+        scope = self.get_cache_scope()
+        origin = f'{request.scheme}://{request.get_host()}'
+        return f'list:{scope}:{get_version(scope)}:{origin}:{query}'
+
+    def list(self, request, *args, **kwargs):
+        if not cache_is_shared():
+            return super().list(request, *args, **kwargs)
+        key = self.get_list_cache_key(request)
+        cache = get_cache()
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, self.cache_timeout)
+        return Response(data)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        bump_version(self.get_cache_scope())
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        bump_version(self.get_cache_scope(), *self.destroy_scopes)
+
+
+class ConditionalGetMixin:
+    """ETag и Last-Modified для `list` и `retrieve` без сериализации.
+
+    Валидаторы строятся из версий областей `get_etag_scopes()`, которые
+    сдвигаются при записи. Они отдаются, только если кеш общий для всех
+    процессов: иначе процесс, не видевший записи, ответил бы 304 на
+    изменённые данные.
+
+    Условия запроса проверяются только для существующего ресурса, иначе
+    `If-None-Match: *` дал бы 304 вместо 404. Для списка до проверки
+    загружается родитель вложенного маршрута, поэтому 304 стоит не больше
+    одного запроса; объект `retrieve` сначала читается целиком.
+    """
+
+    def get_etag_scopes(self):
+        """Области, версии которых определяют ответ; без них валидаторы
+        не отдаются."""
+        return ()
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        scopes = self.get_etag_scopes()
+        if not scopes or not cache_is_shared():
+            return handler(request, *args, **kwargs)
+        versions = get_stamps('version', scopes)
+        etag = '"{}"'.format(hashlib.md5(
+            '|'.join(map(str, [
+                request.get_full_path(),
+                request.accepted_media_type,
+                *versions,
+            ])).encode()
+        ).hexdigest())
+        # Last-Modified точен до секунды: пока идёт секунда последней
+        # записи, он не отдаётся, иначе запись в ту же секунду осталась бы
+        # незамеченной для If-Modified-Since.
+        modified = max(get_stamps('modified', scopes)) // 10 ** 9
+        last_modified = modified if modified < int(time.time()) else None
+
+        if getattr(self, 'detail', False):
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            not_modified = get_conditional_response(
+                request, etag=etag, last_modified=last_modified,
+                response=response,
+            )
+            if not_modified is not response:
+                return not_modified
+        else:
+            self.get_queryset()
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                return response
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,86 @@
+import csv
+import json
+import tempfile
+from itertools import islice
+
+from rest_framework.fields import DateTimeField
+
+from reviews.models import GenreTitle, Review, Title
+
+TITLE_FIELDS = (
+    'id', 'name', 'year', 'description', 'rating', 'rating_count',
+    'category', 'genre',
+)
+REVIEW_FIELDS = ('id', 'title', 'author', 'text', 'score', 'pub_date')
+
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def title_rows(chunk_size):
+    """Все произведения с рейтингом, категорией и slug жанров.
+
+    Жанры загружаются одним запросом на кусок: Django 3.2 не применяет
+    prefetch_related вместе с iterator().
+    """
+    titles = Title.objects.order_by('pk').values_list(
+        'id', 'name', 'year', 'description', 'rating', 'rating_count',
+        'category__slug',
+    ).iterator(chunk_size=chunk_size)
+    for chunk in iter_chunks(titles, chunk_size):
+        genres = {}
+        for title_id, slug in GenreTitle.objects.filter(
+            title_id__in=[row[0] for row in chunk]
+        ).order_by('pk').values_list('title_id', 'genre__slug'):
+            genres.setdefault(title_id, []).append(slug)
+        for row in chunk:
+            yield (*row, genres.get(row[0], []))
+
+
+def review_rows(chunk_size):
+    pub_date = DateTimeField()
+    for row in Review.objects.order_by('pk').values_list(
+        'id', 'title_id', 'author__username', 'text', 'score', 'pub_date',
+    ).iterator(chunk_size=chunk_size):
+        yield (*row[:-1], pub_date.to_representation(row[-1]))
+
+
+def to_ndjson(fields, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n'
+
+
+class Echo:
+    """Файл для csv.writer, возвращающий строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def to_csv(fields, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([
+            ','.join(value) if isinstance(value, list) else value
+            for value in row
+        ])
+
+
+def spool(parts, charset, max_size):
+    """Записывает выгрузку в файл, который держится в памяти до
+    `max_size` байт, а дальше переносится на диск."""
+    file = tempfile.SpooledTemporaryFile(max_size=max_size)
+    for part in parts:
+        file.write(part.encode(charset))
+    file.seek(0)
+    return file
+
+
+FORMATS = {'ndjson': to_ndjson, 'csv': to_csv}
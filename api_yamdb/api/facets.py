@@ -0,0 +1,65 @@
+from django.db.models import Count
+
+from reviews.models import GenreTitle, Title
+
+
+def named_facet(rows):
+    return sorted(
+        ({'slug': slug, 'name': name, 'count': count}
+         for slug, name, count in rows),
+        key=lambda item: (-item['count'], item['name']),
+    )
+
+
+def genre_facet(titles=None):
+    links = GenreTitle.objects.all()
+    if titles is not None:
+        links = links.filter(title__in=titles)
+    return named_facet(
+        links.values('genre').annotate(count=Count('pk')).values_list(
+            'genre__slug', 'genre__name', 'count'
+        ).order_by()
+    )
+
+
+def category_facet(titles=None):
+    queryset = Title.objects.filter(category__isnull=False)
+    if titles is not None:
+        queryset = queryset.filter(pk__in=titles)
+    return named_facet(
+        queryset.values('category').annotate(count=Count('pk')).values_list(
+            'category__slug', 'category__name', 'count'
+        ).order_by()
+    )
+
+
+def year_facet(titles=None):
+    queryset = Title.objects.all()
+    if titles is not None:
+        queryset = queryset.filter(pk__in=titles)
+    return [
+        {'year': year, 'count': count}
+        for year, count in queryset.values('year').annotate(
+            count=Count('pk')
+        ).values_list('year', 'count').order_by('-year')
+    ]
+
+
+FACETS = {
+    'genre': genre_facet,
+    'category': category_facet,
+    'year': year_facet,
+}
+
+
+def title_facets(titles):
+    """Число произведений выборки `titles` по жанрам, категориям и годам.
+
+    Каждый срез — один агрегирующий запрос, выборка входит в него
+    подзапросом; без фильтров агрегаты идут по индексам целиком.
+    """
+    if not titles.query.where:
+        titles = None
+    else:
+        titles = titles.order_by().values('pk')
+    return {name: facet(titles) for name, facet in FACETS.items()}
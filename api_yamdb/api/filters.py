@@ -1,13 +1,62 @@
 from django_filters import rest_framework as filter
+from django_filters.constants import EMPTY_VALUES
 from reviews.models import Title
 
 
+class TitleOrderingFilter(filter.OrderingFilter):
+    """Сортировка с `id` последним ключом в направлении последнего поля.
+
+    Порядок однозначен, и ORDER BY целиком совпадает с индексами
+    произведений, поэтому страница читается проходом по индексу.
+    """
+
+    def filter(self, queryset, value):
+        if value in EMPTY_VALUES:
+            return queryset
+        ordering = [self.get_ordering_value(param) for param in value]
+        pk = '-id' if ordering[-1].startswith('-') else 'id'
+        return queryset.order_by(*ordering, pk)
+
+
+class CharInFilter(filter.BaseInFilter, filter.CharFilter):
+    """Список значений через запятую."""
+
+
 class TitleFilter(filter.FilterSet):
     name = filter.CharFilter(field_name='name')
     year = filter.NumberFilter(field_name='year')
-    genre = filter.CharFilter(field_name='genre__slug')
+    year_min = filter.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filter.NumberFilter(field_name='year', lookup_expr='lte')
+    rating_min = filter.NumberFilter(field_name='rating', lookup_expr='gte')
+    rating_max = filter.NumberFilter(field_name='rating', lookup_expr='lte')
+    genre = filter.CharFilter(method='filter_genre')
+    genre__in = CharInFilter(method='filter_genre_in')
+    genre__all = CharInFilter(method='filter_genre_all')
     category = filter.CharFilter(field_name='category__slug')
+    category__in = CharInFilter(method='filter_category_in')
+    search = filter.CharFilter(method='filter_search')
+    ordering = TitleOrderingFilter(fields=(
+        ('rating', 'rating'),
+        ('rating_count', 'review_count'),
+        ('year', 'year'),
+        ('name', 'name'),
+    ))
 
     class Meta:
         model = Title
-        fields = '__all__'
+        fields = ('name', 'year', 'description', 'genre', 'category')
+
+    def filter_genre(self, queryset, name, value):
+        return queryset.with_genre(value)
+
+    def filter_genre_in(self, queryset, name, value):
+        return queryset.with_genres(value)
+
+    def filter_genre_all(self, queryset, name, value):
+        return queryset.with_genres(value, match_all=True)
+
+    def filter_category_in(self, queryset, name, value):
+        return queryset.with_categories(value)
+
+    def filter_search(self, queryset, name, value):
+        return queryset.search(value)
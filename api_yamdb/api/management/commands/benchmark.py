@@ -0,0 +1,253 @@
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from collections import namedtuple
+
+import django
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+
+from api.authentication import RoleAccessToken
+from api.mixins import QueryCounter
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+BenchRequest = namedtuple(
+    'BenchRequest', 'method path data user expected_status write'
+)
+
+SCENARIOS = (
+    'titles', 'titles_filtered', 'reviews', 'comments', 'review_create',
+    'signup', 'token',
+)
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def percentile(values, rank):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный бенчмарк API: прогоняет запросы через реальные '
+        'маршруты и печатает p50/p95/p99, запросы в секунду и число '
+        'SQL-запросов на запрос. Записи откатываются, поэтому набор данных '
+        'не меняется и результаты сравнимы между коммитами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument(
+            '--scenario', action='append', choices=SCENARIOS,
+            help='Сценарий; можно указать несколько раз. По умолчанию все.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--json', dest='json_path',
+            help='Файл для результатов в JSON.',
+        )
+
+    def handle(self, *args, **options):
+        if not Title.objects.exists() or not Review.objects.exists():
+            raise CommandError(
+                'Нет данных для бенчмарка: выполните generate_dataset.'
+            )
+        if settings.DEBUG:
+            self.stderr.write(
+                'DEBUG включён: журнал SQL-запросов искажает результаты.'
+            )
+        self.random = random.Random(options['seed'])
+        self.client = Client()
+        self.load_sample()
+        total = options['requests'] + options['warmup']
+        results = []
+        for name in options['scenario'] or SCENARIOS:
+            requests = [
+                getattr(self, f'make_{name}')(number)
+                for number in range(total)
+            ]
+            results.append(self.run_scenario(
+                name, requests, options['warmup']
+            ))
+        self.print_results(results)
+        if options['json_path']:
+            report = {
+                'commit': get_commit(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'dataset': {
+                    model._meta.model_name: model.objects.count()
+                    for model in (User, Category, Genre, Title, Review,
+                                  Comment)
+                },
+                'requests': options['requests'],
+                'seed': options['seed'],
+                'results': results,
+            }
+            with open(options['json_path'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    def load_sample(self, size=1000):
+        self.titles = list(
+            Title.objects.order_by('-rating_count').values_list(
+                'id', flat=True
+            )[:size]
+        )
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.categories = list(
+            Category.objects.values_list('slug', flat=True)
+        )
+        self.years = list(
+            Title.objects.order_by().values_list('year', flat=True).distinct()
+        )
+        self.reviews = list(
+            Review.objects.filter(comments__isnull=False).values_list(
+                'title_id', 'id'
+            ).distinct()[:size]
+        ) or list(Review.objects.values_list('title_id', 'id')[:size])
+        self.users = list(User.objects.order_by('id')[:size])
+        self.pages = max(1, min(20, len(self.titles) // 5))
+
+    def make_titles(self, number):
+        page = self.random.randint(1, self.pages)
+        return BenchRequest(
+            'get', f'/api/v1/titles/?page={page}', None, None, 200, False
+        )
+
+    def make_titles_filtered(self, number):
+        filters = []
+        if self.genres:
+            filters.append(f'genre={self.random.choice(self.genres)}')
+        if self.categories and self.random.random() < 0.5:
+            filters.append(f'category={self.random.choice(self.categories)}')
+        if self.random.random() < 0.3:
+            filters.append(f'year={self.random.choice(self.years)}')
+        return BenchRequest(
+            'get', f'/api/v1/titles/?{"&".join(filters)}', None, None, 200,
+            False,
+        )
+
+    def make_reviews(self, number):
+        title_id = self.random.choice(self.titles)
+        return BenchRequest(
+            'get', f'/api/v1/titles/{title_id}/reviews/', None, None, 200,
+            False,
+        )
+
+    def make_comments(self, number):
+        title_id, review_id = self.random.choice(self.reviews)
+        return BenchRequest(
+            'get',
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            None, None, 200, False,
+        )
+
+    def make_review_create(self, number):
+        while True:
+            user = self.random.choice(self.users)
+            title_id = self.random.choice(self.titles)
+            if not Review.objects.filter(
+                author=user, title_id=title_id
+            ).exists():
+                break
+        return BenchRequest(
+            'post', f'/api/v1/titles/{title_id}/reviews/',
+            {'text': 'Бенчмарк', 'score': self.random.randint(1, 10)},
+            user, 201, True,
+        )
+
+    def make_signup(self, number):
+        username = f'bench_signup_{number}'
+        return BenchRequest(
+            'post', '/api/v1/auth/signup/',
+            {'username': username, 'email': f'{username}@yamdb.fake'},
+            None, 200, True,
+        )
+
+    def make_token(self, number):
+        user = self.random.choice(self.users)
+        return BenchRequest(
+            'post', '/api/v1/auth/token/',
+            {
+                'username': user.username,
+                'confirmation_code': default_token_generator.make_token(user),
+            },
+            None, 200, False,
+        )
+
+    def perform(self, request, counter):
+        headers = {}
+        if request.user is not None:
+            headers['HTTP_AUTHORIZATION'] = (
+                f'Bearer {RoleAccessToken.for_user(request.user)}'
+            )
+        send = getattr(self.client, request.method)
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            response = send(request.path, data=request.data, **headers)
+            elapsed = time.perf_counter() - start
+        if response.status_code != request.expected_status:
+            raise CommandError(
+                f'{request.method.upper()} {request.path}: ответ '
+                f'{response.status_code} вместо {request.expected_status}'
+            )
+        return elapsed
+
+    def run_scenario(self, name, requests, warmup):
+        latencies = []
+        queries = []
+        for number, request in enumerate(requests):
+            counter = QueryCounter()
+            if request.write:
+                with transaction.atomic():
+                    elapsed = self.perform(request, counter)
+                    transaction.set_rollback(True)
+            else:
+                elapsed = self.perform(request, counter)
+            if number >= warmup:
+                latencies.append(elapsed * 1000)
+                queries.append(counter.count)
+        return {
+            'scenario': name,
+            'requests': len(latencies),
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'rps': round(len(latencies) / (sum(latencies) / 1000), 1),
+            'queries_per_request': round(statistics.mean(queries), 2),
+        }
+
+    def print_results(self, results):
+        columns = (
+            'scenario', 'requests', 'p50_ms', 'p95_ms', 'p99_ms', 'rps',
+            'queries_per_request',
+        )
+        self.stdout.write(
+            '{:<16}{:>9}{:>10}{:>10}{:>10}{:>9}{:>21}'.format(*columns)
+        )
+        for result in results:
+            self.stdout.write(
+                '{:<16}{:>9}{:>10}{:>10}{:>10}{:>9}{:>21}'.format(
+                    *(result[column] for column in columns)
+                )
+            )
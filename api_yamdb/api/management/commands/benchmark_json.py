@@ -0,0 +1,62 @@
+import io
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.management.comparison import ComparisonCommand
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import (CommentSerializer, ReviewSerializer,
+                             TitleGetSerializer)
+from reviews.models import Comment, Review, Title
+
+
+def round_trip(renderer, parser, data):
+    body = JSONRenderer().render(data)
+
+    def run():
+        renderer.render(data)
+        parser.parse(io.BytesIO(body))
+
+    return run
+
+
+class Command(ComparisonCommand):
+    help = (
+        'Сравнивает JSONRenderer/JSONParser из DRF с FastJSONRenderer/'
+        'FastJSONParser на типичных страницах произведений, отзывов и '
+        'комментариев.'
+    )
+    columns = ('stdlib_ms', 'fast_ms')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write(
+                'orjson не установлен: FastJSONRenderer использует json.'
+            )
+        super().handle(*args, **options)
+
+    def get_cases(self, size):
+        for name, data in self.get_pages(size):
+            yield (
+                name,
+                round_trip(JSONRenderer(), JSONParser(), data),
+                round_trip(FastJSONRenderer(), FastJSONParser(), data),
+            )
+
+    def get_pages(self, size):
+        pages = (
+            ('titles', TitleGetSerializer,
+             Title.objects.for_read().order_by('-rating_count')),
+            ('reviews', ReviewSerializer,
+             Review.objects.select_related('author')),
+            ('comments', CommentSerializer,
+             Comment.objects.select_related('author')),
+        )
+        for name, serializer, queryset in pages:
+            yield name, {
+                'count': queryset.count(),
+                'next': 'http://testserver/api/v1/?page=2',
+                'previous': None,
+                'results': serializer(queryset[:size], many=True).data,
+            }
@@ -0,0 +1,48 @@
+from django.core.management import CommandError
+
+from api.management.comparison import ComparisonCommand
+from api.serializers import (CommentSerializer, CommentValuesSerializer,
+                             ReviewSerializer, ReviewValuesSerializer,
+                             TitleGetSerializer, TitleValuesSerializer)
+from reviews.models import Comment, Review, Title
+
+
+class Command(ComparisonCommand):
+    help = (
+        'Сравнивает ModelSerializer и сериализаторы строк .values() на '
+        'типичных страницах произведений, отзывов и комментариев: время '
+        'включает запросы к БД. Заодно проверяет, что результаты совпадают.'
+    )
+    columns = ('model_ms', 'values_ms')
+
+    def get_cases(self, size):
+        pages = (
+            ('titles', TitleGetSerializer, TitleValuesSerializer,
+             Title.objects.for_read().order_by('-rating_count', 'id')),
+            ('reviews', ReviewSerializer, ReviewValuesSerializer,
+             Review.objects.select_related('author').order_by('id')),
+            ('comments', CommentSerializer, CommentValuesSerializer,
+             Comment.objects.select_related('author').order_by('id')),
+        )
+        for name, model_serializer, values_serializer, queryset in pages:
+            queryset = queryset[:size]
+            model_page, values_page = self.get_pages(
+                model_serializer, values_serializer, queryset
+            )
+            if values_page() != model_page():
+                raise CommandError(
+                    f'{name}[{size}]: результаты сериализаторов различны.'
+                )
+            yield name, model_page, values_page
+
+    @staticmethod
+    def get_pages(model_serializer, values_serializer, queryset):
+        def model_page():
+            return model_serializer(queryset.all(), many=True).data
+
+        def values_page():
+            return values_serializer(
+                values_serializer.get_values(queryset.all()), many=True
+            ).data
+
+        return model_page, values_page
@@ -0,0 +1,168 @@
+import re
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from api.authentication import RoleAccessToken
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+PAGE_LIMIT = re.compile(r'\sLIMIT \S+(?: OFFSET \S+)?$')
+PAGE_PREFETCH = re.compile(
+    r' WHERE "\w+"\."\w+" IN \((?:%s, )*%s\) ORDER BY [^()]+$'
+)
+
+
+class QueryCollector:
+    """Запоминает SELECT-запросы вместе с параметрами."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def get_problems(sql, plan):
+    """Строки плана с полным просмотром таблицы или временной сортировкой.
+
+    Просмотр таблицы в порядке первичного ключа под LIMIT страницы не
+    считается полным: он останавливается, набрав страницу. Сортировка
+    prefetch-запроса по ключам одной страницы ограничена размером
+    страницы и тоже допускается.
+    """
+    return [
+        detail for detail in plan
+        if 'USE TEMP B-TREE' in detail and not (
+            detail == 'USE TEMP B-TREE FOR ORDER BY'
+            and PAGE_PREFETCH.search(sql)
+        )
+        or detail.startswith('SCAN ') and ' USING ' not in detail
+        and detail != 'SCAN CONSTANT ROW' and not PAGE_LIMIT.search(sql)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет EXPLAIN QUERY PLAN для запросов на чтение каждого '
+        'вьюсета и завершается с ошибкой, если запрос просматривает '
+        'таблицу целиком или сортирует во временном B-дереве. Запросы '
+        'выполняются на тестовых объектах в транзакции, которая '
+        'откатывается.'
+    )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        if connection.vendor != 'sqlite':
+            raise CommandError(
+                'Проверка планов поддерживается только для SQLite.'
+            )
+        # Кеш API подменяется пустым, иначе ответы пришли бы из кеша без
+        # запросов, а откатываемые объекты попали бы в настоящий кеш.
+        caches = {
+            **settings.CACHES,
+            'query_plans': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'query-plans',
+            },
+        }
+        failed = []
+        with override_settings(CACHES=caches, API_CACHE_ALIAS='query_plans'):
+            with transaction.atomic():
+                for path, queries in self.collect_queries():
+                    failed += self.check_queries(path, queries)
+                transaction.set_rollback(True)
+        if failed:
+            raise CommandError(
+                f'Запросов с неудачным планом: {len(failed)}.'
+            )
+        self.stdout.write('Все запросы используют индексы.')
+
+    def get_paths(self):
+        user = User.objects.create(
+            username='query_plans', email='query_plans@yamdb.fake',
+            role=User.ADMIN,
+        )
+        category = Category.objects.create(name='План', slug='query-plans')
+        genre = Genre.objects.create(name='План', slug='query-plans')
+        title = Title.objects.create(name='План', year=2000, category=category)
+        title.genre.add(genre)
+        review = Review.objects.create(
+            author=user, title=title, text='План', score=5
+        )
+        comment = Comment.objects.create(
+            author=user, review=review, text='План'
+        )
+        reviews = f'/api/v1/titles/{title.id}/reviews/'
+        comments = f'{reviews}{review.id}/comments/'
+        return user, (
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            '/api/v1/titles/?pagination=cursor',
+            '/api/v1/titles/?year=2000',
+            f'/api/v1/titles/?genre={genre.slug}',
+            f'/api/v1/titles/?category={category.slug}',
+            '/api/v1/titles/?ordering=-rating',
+            '/api/v1/titles/?ordering=-rating&pagination=cursor',
+            f'/api/v1/titles/?ordering=-rating&genre={genre.slug}'
+            '&pagination=cursor',
+            f'/api/v1/titles/?ordering=-rating&category={category.slug}',
+            '/api/v1/titles/?ordering=-review_count',
+            '/api/v1/titles/?year_min=1990&year_max=2000',
+            '/api/v1/titles/?rating_min=5&ordering=-rating',
+            f'/api/v1/titles/?genre__in={genre.slug},{genre.slug}-2',
+            f'/api/v1/titles/?genre__all={genre.slug},{genre.slug}-2'
+            '&pagination=cursor',
+            f'/api/v1/titles/?category__in={category.slug},{category.slug}-2',
+            '/api/v1/titles/?ordering=year',
+            '/api/v1/titles/?ordering=name&pagination=cursor',
+            '/api/v1/titles/facets/',
+            f'/api/v1/titles/{title.id}/',
+            reviews,
+            f'{reviews}?pagination=cursor',
+            f'{reviews}{review.id}/',
+            comments,
+            f'{comments}{comment.id}/',
+            '/api/v1/users/',
+            f'/api/v1/users/{user.username}/',
+        )
+
+    def collect_queries(self):
+        user, paths = self.get_paths()
+        client = Client(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+        for path in paths:
+            collector = QueryCollector()
+            with connection.execute_wrapper(collector):
+                response = client.get(path)
+            if response.status_code != 200:
+                raise CommandError(
+                    f'GET {path}: ответ {response.status_code} вместо 200'
+                )
+            yield path, collector.queries
+
+    def check_queries(self, path, queries):
+        failed = []
+        for sql, params in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = [row[-1] for row in cursor.fetchall()]
+            problems = get_problems(sql, plan)
+            if problems:
+                failed.append(sql)
+                self.stdout.write(self.style.ERROR(f'GET {path}'))
+                self.stdout.write(f'  {sql}')
+                for detail in problems:
+                    self.stdout.write(f'  {detail}')
+            elif self.verbosity > 1:
+                self.stdout.write(f'GET {path}\n  {sql}')
+                for detail in plan:
+                    self.stdout.write(f'  {detail}')
+        return failed
@@ -0,0 +1,49 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from reviews.models import Review, Title
+
+
+def measure(function, iterations):
+    """Среднее время вызова `function` в миллисекундах."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+class ComparisonCommand(BaseCommand):
+    """Сравнение двух реализаций на страницах разных размеров.
+
+    Подкласс задаёт заголовки колонок `columns` и перечисляет в
+    `get_cases()` тройки (страница, базовая функция, новая функция).
+    """
+    columns = ('base_ms', 'new_ms')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument(
+            '--page-size', type=int, action='append',
+            help='Размер страницы; можно указать несколько раз. '
+                 'По умолчанию 5 и 100.',
+        )
+
+    def get_cases(self, size):
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        if not Title.objects.exists() or not Review.objects.exists():
+            raise CommandError(
+                'Нет данных для бенчмарка: выполните generate_dataset.'
+            )
+        self.stdout.write('{:<18}{:>12}{:>12}{:>10}'.format(
+            'page', *self.columns, 'speedup'
+        ))
+        for size in options['page_size'] or (5, 100):
+            for name, base, new in self.get_cases(size):
+                base_ms = measure(base, options['iterations'])
+                new_ms = measure(new, options['iterations'])
+                self.stdout.write('{:<18}{:>12.3f}{:>12.3f}{:>9.1f}x'.format(
+                    f'{name}[{size}]', base_ms, new_ms, base_ms / new_ms
+                ))
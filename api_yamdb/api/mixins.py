@@ -0,0 +1,161 @@
+import logging
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.shortcuts import get_object_or_404
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    """Обработка запроса выполнила больше SQL-запросов, чем разрешено."""
+
+
+class QueryCounter:
+    """Считает SQL-запросы и суммарное время их выполнения."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.auth_count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+    @property
+    def budgeted_count(self):
+        return self.count - self.auth_count
+
+
+class QueryBudgetMixin:
+    """Бюджет SQL-запросов на действие вьюсета.
+
+    Запросы аутентификации в бюджет не входят, их число отдаётся
+    отдельным заголовком X-Query-Auth-Count. Бюджеты задаются атрибутом
+    `query_budgets` и переопределяются настройкой QUERY_BUDGETS по ключу
+    `<ИмяВьюсета>.<действие>`. При превышении пишет предупреждение в лог,
+    а при QUERY_BUDGET_RAISE = True выбрасывает QueryBudgetExceeded.
+    """
+    query_budgets = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        self.query_counter = QueryCounter()
+        with connection.execute_wrapper(self.query_counter):
+            response = super().dispatch(request, *args, **kwargs)
+        self.check_query_budget(response)
+        return response
+
+    def perform_authentication(self, request):
+        before = self.query_counter.count
+        super().perform_authentication(request)
+        self.query_counter.auth_count += self.query_counter.count - before
+
+    def get_query_budget(self):
+        action = getattr(self, 'action', None) or self.request.method.lower()
+        key = f'{type(self).__name__}.{action}'
+        budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        if key in budgets:
+            return key, budgets[key]
+        return key, self.query_budgets.get(action)
+
+    def check_query_budget(self, response):
+        counter = self.query_counter
+        key, budget = self.get_query_budget()
+        if getattr(settings, 'DEBUG', False) or getattr(
+            settings, 'QUERY_BUDGET_HEADERS', False
+        ):
+            response['X-Query-Count'] = counter.count
+            response['X-Query-Auth-Count'] = counter.auth_count
+            response['X-Query-Time'] = f'{counter.duration * 1000:.2f}'
+            if budget is not None:
+                response['X-Query-Budget'] = budget
+        if budget is None or counter.budgeted_count <= budget:
+            return
+        message = (
+            f'{key}: выполнено {counter.budgeted_count} SQL-запросов '
+            f'при бюджете {budget} ({counter.duration * 1000:.2f} мс)'
+        )
+        if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class ParentLookupMixin:
+    """Родительский объект вложенного маршрута, один на запрос.
+
+    `parent_lookups` сопоставляет аргументы URL полям `parent_model`, поэтому
+    вся цепочка URL проверяется одним запросом. Объект запоминается на
+    представлении: `get_queryset()` и `perform_create()` получают его через
+    `get_parent()` без повторных запросов.
+    """
+    parent_model = None
+    parent_lookups = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model,
+                **{
+                    field: self.kwargs[kwarg]
+                    for kwarg, field in self.parent_lookups.items()
+                },
+            )
+        return self._parent
+
+
+def render_in_thread(view, request, *args, **kwargs):
+    """Выполняет и рендерит ответ целиком в потоке пула."""
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+class AsyncReadMixin:
+    """Асинхронная точка входа для чтения под ASGI.
+
+    Django 3.2 выполняет синхронные view под ASGI в одном общем потоке,
+    поэтому запросы к БД всех клиентов идут друг за другом. При
+    ASYNC_READ_VIEWS = True действия `async_actions` для GET/HEAD
+    выполняются в общем пуле потоков параллельно, а пока идёт запрос к БД,
+    цикл событий обслуживает остальных клиентов. Запись остаётся
+    синхронной.
+    """
+    async_actions = ('list', 'retrieve')
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not getattr(settings, 'ASYNC_READ_VIEWS', False):
+            return view
+        read_methods = {
+            method for method, action in actions.items()
+            if method == 'get' and action in cls.async_actions
+        }
+        if read_methods:
+            read_methods.add('head')
+        read = sync_to_async(
+            lambda *args, **kwargs: render_in_thread(view, *args, **kwargs),
+            thread_sensitive=False,
+        )
+        write = sync_to_async(view, thread_sensitive=True)
+
+        @wraps(view)
+        async def async_view(request, *args, **kwargs):
+            if request.method.lower() in read_methods:
+                return await read(request, *args, **kwargs)
+            return await write(request, *args, **kwargs)
+
+        return async_view
@@ -0,0 +1,172 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """Постраничная пагинация с включаемым курсорным (keyset) режимом.
+
+    По умолчанию работает как PageNumberPagination. Параметр
+    `?pagination=cursor` переключает на курсор: страница выбирается
+    условием по значениям сортировки последней строки, без OFFSET и COUNT.
+    Размер страницы `?page_size=` (до `max_page_size`) принимают оба режима.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def is_keyset_requested(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.is_keyset_requested(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        position, self.reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [(name, not desc) for name, desc in ordering]
+        queryset = queryset.order_by(
+            *(f'-{name}' if desc else name for name, desc in ordering)
+        )
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(
+                ordering, position
+            ))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+        self.has_position = position is not None
+        self.rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        has_next = self.has_position if self.reverse else self.has_more
+        if not has_next or not self.rows:
+            return None
+        return self.encode_cursor(self.rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        has_previous = self.has_more if self.reverse else self.has_position
+        if not has_previous or not self.rows:
+            return None
+        return self.encode_cursor(self.rows[0], reverse=True)
+
+    def get_ordering(self, queryset):
+        """Сортировка queryset с id в конце для однозначного порядка."""
+        ordering = []
+        pk_name = queryset.model._meta.pk.name
+        for item in queryset.query.order_by or queryset.model._meta.ordering:
+            desc = item.startswith('-')
+            name = item.lstrip('-')
+            ordering.append((pk_name if name == 'pk' else name, desc))
+        if not any(name == pk_name for name, _ in ordering):
+            ordering.append((pk_name, ordering[-1][1] if ordering else False))
+        return ordering
+
+    def get_position_filter(self, ordering, position):
+        """Условие «строго после позиции» для составного ключа сортировки."""
+        condition = Q()
+        equal = Q()
+        for (name, desc), value in zip(ordering, position):
+            condition |= equal & self.get_after_filter(name, desc, value)
+            if value is None:
+                equal &= Q(**{f'{name}__isnull': True})
+            else:
+                equal &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def get_after_filter(name, desc, value):
+        nulls_largest = connection.features.nulls_order_largest
+        if value is None:
+            if desc == nulls_largest:
+                return Q(**{f'{name}__isnull': False})
+            return Q(pk__in=[])
+        after = Q(**{f'{name}__{"lt" if desc else "gt"}': value})
+        if desc != nulls_largest:
+            after |= Q(**{f'{name}__isnull': True})
+        return after
+
+    def encode_cursor(self, row, reverse):
+        position = [
+            self.encode_value(
+                row[name] if isinstance(row, dict) else getattr(row, name)
+            )
+            for name, _ in self.ordering
+        ]
+        payload = json.dumps({'p': position, 'r': int(reverse)})
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = replace_query_param(url, self.mode_query_param, 'cursor')
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    @staticmethod
+    def encode_value(value):
+        if value is None or isinstance(value, (int, float, str)):
+            return value
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return str(value)
+
+    @staticmethod
+    def decode_value(model, name, value):
+        if value is None:
+            return None
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def decode_cursor(self, request, model):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            position = [
+                self.decode_value(model, name, value)
+                for (name, _), value in zip(self.ordering, payload['p'])
+            ]
+            reverse = bool(payload.get('r'))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
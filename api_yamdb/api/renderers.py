@@ -0,0 +1,68 @@
+import json
+
+from django.utils.datastructures import MultiValueDict
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если он установлен, иначе на json.
+
+    Даты, Decimal, ленивые строки и прочие типы, которые не сериализует
+    сам orjson, кодируются JSONEncoder из DRF, поэтому ответ совпадает с
+    JSONRenderer побайтно. Отступы и ASCII-вывод отдаются JSONRenderer.
+    """
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None
+            or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if isinstance(data, MultiValueDict):
+            # orjson сериализует подклассы dict по их содержимому, то есть
+            # списками значений; json берёт последнее значение ключа.
+            data = data.dict()
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=self.options,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
+
+
+class StreamRenderer(BaseRenderer):
+    """Формат потоковой выгрузки, выбирается по `?format=` или Accept.
+
+    Данные представление пишет в StreamingHttpResponse само, через
+    рендерер проходят только ошибки — они отдаются в JSON.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, ensure_ascii=False).encode()
+
+
+class NDJSONRenderer(StreamRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class CSVRenderer(StreamRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
@@ -1,6 +1,8 @@
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from rest_framework.serializers import ValidationError
 
+from api.values import Column, Nested, Related, ValuesSerializer
 from reviews.models import Comment, Genre, Category, Title, Review, User
 
 REGEX_NAME = r'^(?!me\Z)^[\w.@+-]+\Z'
@@ -32,6 +34,21 @@ class TitleGetSerializer(serializers.ModelSerializer):
         model = Title
 
 
+class TitleValuesSerializer(ValuesSerializer):
+    """TitleGetSerializer для чтения из строк `.values()`."""
+    fields = {
+        'id': 'id',
+        'rating': 'rating',
+        'name': 'name',
+        'year': 'year',
+        'description': 'description',
+        'genre': Related(
+            Genre.objects.order_by('name'), 'titles', ('name', 'slug')
+        ),
+        'category': Nested('category', ('name', 'slug')),
+    }
+
+
 class TitleCreateUpdateSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True)
     genre = serializers.SlugRelatedField(
@@ -47,6 +64,48 @@ class TitleCreateUpdateSerializer(serializers.ModelSerializer):
         model = Title
 
 
+class PreloadedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField без запроса на каждое значение: объекты берутся из
+    `context['preloaded']`, загруженного сразу для всего массива."""
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        objects = self.context['preloaded'][self.queryset.model]
+        if data not in objects:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+        return objects[data]
+
+
+class NamedBulkSerializer(serializers.Serializer):
+    """Элемент массовой загрузки категорий и жанров."""
+    name = serializers.CharField(max_length=256)
+    slug = serializers.SlugField(max_length=50)
+
+
+class TitleBulkSerializer(serializers.ModelSerializer):
+    """Элемент массовой загрузки произведений: с `id` — обновление."""
+    id = serializers.IntegerField(required=False)
+    genre = PreloadedSlugRelatedField(
+        slug_field='slug', many=True, queryset=Genre.objects.all()
+    )
+    category = PreloadedSlugRelatedField(
+        slug_field='slug', queryset=Category.objects.all()
+    )
+
+    class Meta:
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+        model = Title
+
+    def validate_id(self, value):
+        if value not in self.context['preloaded'][Title]:
+            raise ValidationError('Произведение не найдено.')
+        return value
+
+
 class UserSerializer(serializers.ModelSerializer):
     username = USERNAME_FIELD
     email = serializers.EmailField(max_length=254, required=True)
@@ -143,22 +202,15 @@ class ReviewSerializer(serializers.ModelSerializer):
         default=serializers.CurrentUserDefault(),
     )
 
+    default_error_messages = {
+        'already_reviewed': 'Вы уже оставляли отзыв на это произведение',
+    }
+
     class Meta:
         fields = ('id', 'author', 'text', 'title', 'score', 'pub_date')
         model = Review
         read_only_fields = ('title',)
 
-    def validate(self, data):
-        if self.context.get('request').method != 'POST':
-            return data
-        author = self.context.get('request').user
-        title_id = self.context.get('view').kwargs.get('title_id')
-        if Review.objects.filter(author=author, title=title_id).exists():
-            raise serializers.ValidationError(
-                'Вы уже оставляли отзыв на это произведение'
-            )
-        return data
-
 
 class CommentSerializer(serializers.ModelSerializer):
     author = serializers.StringRelatedField(
@@ -170,3 +222,30 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'author', 'text', 'review', 'pub_date')
         model = Comment
         read_only_fields = ('review',)
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """ReviewSerializer для чтения из строк `.values()`."""
+    fields = {
+        'id': 'id',
+        'author': 'author__username',
+        'text': 'text',
+        'title': 'title',
+        'score': 'score',
+        'pub_date': Column(
+            'pub_date', serializers.DateTimeField().to_representation
+        ),
+    }
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """CommentSerializer для чтения из строк `.values()`."""
+    fields = {
+        'id': 'id',
+        'author': 'author__username',
+        'text': 'text',
+        'review': 'review',
+        'pub_date': Column(
+            'pub_date', serializers.DateTimeField().to_representation
+        ),
+    }
@@ -8,7 +8,8 @@ from api.views import (CategoryViewSet,
                        token_created_view,
                        UserViewSet,
                        ReviewViewSet,
-                       CommentViewSet)
+                       CommentViewSet,
+                       ExportViewSet)
 
 from api.views import CategoryViewSet, GenreViewSet, TitleViewSet
 
@@ -17,6 +18,7 @@ router.register('categories', CategoryViewSet, basename='categories')
 router.register('genres', GenreViewSet, basename='genres')
 router.register('titles', TitleViewSet, basename='titles')
 router.register('users', UserViewSet, basename='users')
+router.register('export', ExportViewSet, basename='export')
 router.register(
     r'titles/(?P<title_id>\d+)/reviews', ReviewViewSet, basename='reviews'
 )
@@ -0,0 +1,270 @@
+from operator import itemgetter
+
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+class Column:
+    """Колонка строки `.values()`, при необходимости с преобразованием."""
+
+    def __init__(self, name, convert=None):
+        self.name = name
+        self.convert = convert
+
+    def get_columns(self):
+        return (self.name,)
+
+    def compile(self):
+        get = itemgetter(self.name)
+        convert = self.convert
+        if convert is None:
+            return get
+        return lambda row: convert(get(row))
+
+
+class Nested:
+    """Вложенный объект по внешнему ключу: `None`, если связи нет."""
+
+    def __init__(self, relation, fields):
+        self.relation = relation
+        self.fields = fields
+
+    def get_columns(self):
+        return (self.relation, *(
+            f'{self.relation}__{name}' for name in self.fields
+        ))
+
+    def compile(self):
+        relation = self.relation
+        pairs = tuple(
+            (name, f'{relation}__{name}') for name in self.fields
+        )
+
+        def get(row):
+            if row[relation] is None:
+                return None
+            return {name: row[column] for name, column in pairs}
+
+        return get
+
+
+class Related:
+    """Список связанных объектов: один запрос на все строки страницы.
+
+    Запрос повторяет запрос prefetch_related, поэтому порядок элементов
+    совпадает с ModelSerializer.
+    """
+
+    def __init__(self, queryset, lookup, fields):
+        self.queryset = queryset
+        self.lookup = lookup
+        self.fields = fields
+
+    def get_columns(self):
+        return ('id',)
+
+    def load(self, ids):
+        related = {}
+        for owner_id, *values in self.queryset.filter(
+            **{f'{self.lookup}__in': ids}
+        ).values_list(self.lookup, *self.fields):
+            related.setdefault(owner_id, []).append(
+                dict(zip(self.fields, values))
+            )
+        return related
+
+
+class ValuesSerializer:
+    """Сериализатор для чтения из строк `.values()`.
+
+    План полей `fields` компилируется один раз при объявлении класса в
+    кортеж функций от строки, поэтому представление строки — это один
+    проход по плану без экземпляров моделей и полей DRF. Строка — колонка
+    с тем же именем.
+    """
+    fields = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = {
+            key: Column(field) if isinstance(field, str) else field
+            for key, field in cls.fields.items()
+        }
+        cls.columns = tuple(dict.fromkeys(
+            column for field in fields.values()
+            for column in field.get_columns()
+        ))
+        cls.related = tuple(
+            (key, field) for key, field in fields.items()
+            if isinstance(field, Related)
+        )
+        cls.plan = tuple(
+            (key, itemgetter(key) if isinstance(field, Related)
+             else field.compile())
+            for key, field in fields.items()
+        )
+        cls.subsets = {}
+
+    @classmethod
+    def with_fields(cls, keys):
+        """Подкласс с планом только для полей `keys`."""
+        keys = tuple(key for key in cls.fields if key in keys)
+        if keys == tuple(cls.fields):
+            return cls
+        if keys not in cls.subsets:
+            cls.subsets[keys] = type(cls.__name__, (cls,), {
+                'fields': {key: cls.fields[key] for key in keys},
+            })
+        return cls.subsets[keys]
+
+    def __init__(self, instance, many=False):
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def get_values(cls, queryset, *extra):
+        """Строки queryset с колонками плана и `extra`."""
+        columns = cls.columns + tuple(
+            name for name in extra if name not in cls.columns
+        )
+        return queryset.prefetch_related(None).values(*columns)
+
+    def load_related(self, rows):
+        if not self.related or not rows:
+            return
+        ids = [row['id'] for row in rows]
+        for key, field in self.related:
+            related = field.load(ids)
+            for row in rows:
+                row[key] = related.get(row['id'], [])
+
+    @property
+    def data(self):
+        rows = list(self.instance) if self.many else [self.instance]
+        self.load_related(rows)
+        plan = self.plan
+        data = [{key: get(row) for key, get in plan} for row in rows]
+        return data if self.many else data[0]
+
+
+class ValuesReadMixin:
+    """`list` и `retrieve` через `values_serializer_class`.
+
+    Параметры `?fields=` и `?exclude=` со списком полей через запятую
+    оставляют в ответе только часть полей: невыбранные колонки, связи и
+    запросы жанров не выполняются. Настройка VALUES_SERIALIZERS = False
+    возвращает обычный сериализатор вьюсета; выбор полей тогда сводится к
+    `.only()` и обрезке полей сериализатора.
+    """
+    values_serializer_class = None
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+
+    def use_values_serializer(self):
+        return (
+            self.request.method in permissions.SAFE_METHODS
+            and getattr(settings, 'VALUES_SERIALIZERS', True)
+        )
+
+    def get_requested_fields(self):
+        """Выбранные поля ответа или None, если выбраны все."""
+        if self.request.method not in permissions.SAFE_METHODS:
+            return None
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+        available = tuple(self.values_serializer_class.fields)
+        keys = available
+        errors = {}
+        for param in (self.fields_query_param, self.exclude_query_param):
+            value = self.request.query_params.get(param)
+            if not value:
+                continue
+            names = [name.strip() for name in value.split(',')]
+            unknown = [name for name in names if name not in available]
+            if unknown:
+                errors[param] = [f'Неизвестные поля: {", ".join(unknown)}.']
+            elif param == self.fields_query_param:
+                keys = tuple(key for key in keys if key in names)
+            else:
+                keys = tuple(key for key in keys if key not in names)
+        if not errors and not keys:
+            errors[self.fields_query_param] = ['Не выбрано ни одного поля.']
+        if errors:
+            raise ValidationError(errors)
+        self._requested_fields = None if keys == available else keys
+        return self._requested_fields
+
+    def get_values_serializer_class(self):
+        keys = self.get_requested_fields()
+        if keys is None:
+            return self.values_serializer_class
+        return self.values_serializer_class.with_fields(keys)
+
+    @staticmethod
+    def get_ordering_columns(queryset):
+        return [
+            name.lstrip('-') for name in (
+                queryset.query.order_by or queryset.model._meta.ordering
+            )
+            if isinstance(name, str) and name.lstrip('-') != 'pk'
+        ]
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_requested_fields() is None:
+            return queryset
+        serializer_class = self.get_values_serializer_class()
+        columns = [*serializer_class.columns, *(
+            name for name in self.get_ordering_columns(queryset)
+            if name not in queryset.query.annotations
+        )]
+        relations = {
+            column.split('__')[0] for column in columns if '__' in column
+        }
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        if not serializer_class.related:
+            queryset = queryset.prefetch_related(None)
+        return queryset.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        keys = self.get_requested_fields()
+        if keys is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in [name for name in fields if name not in keys]:
+                fields.pop(name)
+        return serializer
+
+    def get_values_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.get_values_serializer_class().get_values(
+            queryset, *self.get_ordering_columns(queryset)
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_values_serializer():
+            return super().list(request, *args, **kwargs)
+        serializer_class = self.get_values_serializer_class()
+        queryset = self.get_values_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer_class(page, many=True).data
+            )
+        return Response(serializer_class(queryset, many=True).data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_values_serializer():
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            self.get_values_queryset(),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(request, row)
+        return Response(self.get_values_serializer_class()(row).data)
@@ -1,7 +1,9 @@
-from django.db.models import Avg
-from django.conf import settings
+from urllib.parse import urlencode
+
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.db import IntegrityError, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter
@@ -13,10 +15,12 @@ from rest_framework import (mixins,
 from rest_framework.permissions import (IsAuthenticated,
                                         AllowAny,
                                         IsAuthenticatedOrReadOnly)
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.settings import api_settings
 
+from users.outbox import queue_email
 from reviews.models import (Category,
                             Genre,
                             Title,
@@ -26,57 +30,176 @@ from api.permissions import (AdminModerOrReadOnly,
                              SuperAdmOrReadOnly,
                              IsAdmin)
 from api.serializers import (CategorySerializer,
+                             NamedBulkSerializer,
+                             TitleBulkSerializer,
                              GenreSerializer,
                              TitleGetSerializer,
+                             TitleValuesSerializer,
                              TitleCreateUpdateSerializer,
                              ReviewSerializer,
+                             ReviewValuesSerializer,
                              CommentSerializer,
+                             CommentValuesSerializer,
                              TokenSerializer,
                              UserCreateSerializer,
                              UserMeSerializer,
                              UserSerializer)
+from api.authentication import RoleAccessToken, load_user
+from api.bulk import NamedBulkUpsertMixin, TitleBulkUpsertMixin
+from api.cache import (ConditionalGetMixin,
+                       VersionedListCacheMixin,
+                       bump_version,
+                       cache_is_shared,
+                       get_cache,
+                       get_stamps)
+from api.export import (FORMATS, REVIEW_FIELDS, TITLE_FIELDS, review_rows,
+                        spool, title_rows)
+from api.facets import title_facets
 from api.filters import TitleFilter
+from api.mixins import AsyncReadMixin, ParentLookupMixin, QueryBudgetMixin
+from api.pagination import KeysetPagination
+from api.renderers import CSVRenderer, NDJSONRenderer
+from api.values import ValuesReadMixin
 
 
-class CategoryViewSet(mixins.CreateModelMixin,
+class CategoryViewSet(AsyncReadMixin,
+                      QueryBudgetMixin,
+                      NamedBulkUpsertMixin,
+                      VersionedListCacheMixin,
+                      mixins.CreateModelMixin,
                       mixins.DestroyModelMixin,
                       mixins.ListModelMixin,
                       viewsets.GenericViewSet,):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_scope = 'categories'
+    destroy_scopes = ('titles', 'facets', 'catalog')
+    bulk_serializer_class = NamedBulkSerializer
+    bulk_scopes = ('categories', 'titles', 'facets', 'catalog')
     filter_backends = (SearchFilter,)
     search_fields = ['name']
     lookup_field = 'slug'
     permission_classes = (SuperAdmOrReadOnly,)
     pagination_class = PageNumberPagination
+    query_budgets = {'list': 2}
 
 
-class GenreViewSet(mixins.CreateModelMixin,
+class GenreViewSet(AsyncReadMixin,
+                   QueryBudgetMixin,
+                   NamedBulkUpsertMixin,
+                   VersionedListCacheMixin,
+                   mixins.CreateModelMixin,
                    mixins.DestroyModelMixin,
                    mixins.ListModelMixin,
                    viewsets.GenericViewSet,):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_scope = 'genres'
+    destroy_scopes = ('titles', 'facets', 'catalog')
+    bulk_serializer_class = NamedBulkSerializer
+    bulk_scopes = ('genres', 'titles', 'facets', 'catalog')
     filter_backends = (SearchFilter,)
     search_fields = ['name']
     lookup_field = 'slug'
     permission_classes = (SuperAdmOrReadOnly,)
     pagination_class = PageNumberPagination
+    query_budgets = {'list': 2}
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')).all()
+class TitleViewSet(AsyncReadMixin,
+                   QueryBudgetMixin,
+                   TitleBulkUpsertMixin,
+                   ConditionalGetMixin,
+                   ValuesReadMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.all()
+    values_serializer_class = TitleValuesSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
     permission_classes = (SuperAdmOrReadOnly,)
-    pagination_class = PageNumberPagination
+    pagination_class = KeysetPagination
+    query_budgets = {'list': 3, 'retrieve': 2, 'facets': 3}
+    async_actions = ('list', 'retrieve', 'facets')
+    bulk_serializer_class = TitleBulkSerializer
+    bulk_scopes = ('titles', 'facets')
+    facets_cache_timeout = 60 * 60
+    rating_filters = ('rating_min', 'rating_max')
+
+    def get_queryset(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.queryset.for_read()
+        return self.queryset.all()
 
     def get_serializer_class(self):
         if self.request.method in permissions.SAFE_METHODS:
             return TitleGetSerializer
         return TitleCreateUpdateSerializer
 
+    def get_etag_scopes(self):
+        """Произведение зависит от своей строки, своих отзывов (рейтинг) и
+        области `catalog`, которую сдвигают записи жанров, категорий и
+        массовые пересчёты рейтинга."""
+        if self.action == 'facets':
+            return self.get_facets_scopes()
+        if self.action == 'retrieve':
+            pk = self.kwargs.get('pk')
+            return ('catalog', f'title:{pk}', f'reviews:{pk}')
+        return ('titles',)
+
+    def get_facets_scopes(self):
+        """Фасеты меняются только при записи произведений, жанров и
+        категорий; рейтинг, который двигают отзывы, важен лишь с фильтром
+        по нему."""
+        if any(name in self.request.query_params
+               for name in self.rating_filters):
+            return ('facets', 'titles')
+        return ('facets',)
+
+    @action(detail=False)
+    def facets(self, request):
+        """Число произведений по жанрам, категориям и годам для текущих
+        фильтров. Кешируется до изменения произведений."""
+        return self.get_conditional_response(self.get_facets, request)
+
+    def get_facets(self, request):
+        if not cache_is_shared():
+            return Response(
+                title_facets(self.filter_queryset(Title.objects.all()))
+            )
+        params = urlencode(sorted(
+            (name, value) for name, value in request.query_params.items()
+            if name in self.filterset_class.base_filters
+            and name != 'ordering'
+        ))
+        versions = ':'.join(
+            map(str, get_stamps('version', self.get_facets_scopes()))
+        )
+        key = f'facets:{versions}:{params}'
+        cache = get_cache()
+        data = cache.get(key)
+        if data is None:
+            data = title_facets(self.filter_queryset(Title.objects.all()))
+            cache.set(key, data, self.facets_cache_timeout)
+        return Response(data)
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        bump_version('titles', 'facets')
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        bump_version(
+            'titles', 'facets', f'title:{serializer.instance.id}'
+        )
+
+    def perform_destroy(self, instance):
+        title_id = instance.id
+        super().perform_destroy(instance)
+        bump_version(
+            'titles', 'facets', f'title:{title_id}', f'reviews:{title_id}',
+            'comments',
+        )
+
 
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
@@ -105,27 +228,26 @@ def user_created_view(request):
     serializer.is_valid(raise_exception=True)
     email = serializer.validated_data.get('email')
     username = serializer.validated_data.get('username')
-    try:
-        user, _ = User.objects.get_or_create(
-            username=username,
-            email=email,
+    with transaction.atomic():
+        try:
+            user, _ = User.objects.get_or_create(
+                username=username,
+                email=email,
+            )
+        except Exception:
+            return Response(
+                request.data,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        confirmation_code = default_token_generator.make_token(user)
+        User.objects.filter(username=username).update(
+            confirmation_code=confirmation_code
         )
-    except Exception:
-        return Response(
-            request.data,
-            status=status.HTTP_400_BAD_REQUEST
+        queue_email(
+            'Регистрация YaMDB',
+            f'Ваш код подтверждения{confirmation_code}',
+            user.email,
         )
-    confirmation_code = default_token_generator.make_token(user)
-    User.objects.filter(username=username).update(
-        confirmation_code=confirmation_code
-    )
-    send_mail(
-        'Регистрация YaMDB',
-        f'Ваш код подтверждения{confirmation_code}',
-        settings.ADMIN_EMAIL,
-        [user.email],
-        fail_silently=False
-    )
     return Response(
         request.data,
         status=status.HTTP_200_OK
@@ -145,7 +267,7 @@ def token_created_view(request):
         user,
         serializer.validated_data['confirmation_code']
     ):
-        token = AccessToken.for_user(user)
+        token = RoleAccessToken.for_user(user)
         return Response(
             {'token': f'{token}'},
             status=status.HTTP_200_OK
@@ -155,7 +277,7 @@ def token_created_view(request):
     )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(QueryBudgetMixin, viewsets.ModelViewSet):
     lookup_field = 'username'
     queryset = User.objects.all()
     serializer_class = UserSerializer
@@ -163,6 +285,7 @@ class UserViewSet(viewsets.ModelViewSet):
     filter_backends = (DjangoFilterBackend, SearchFilter)
     search_fields = ('username',)
     permission_classes = (IsAdmin,)
+    query_budgets = {'list': 2, 'retrieve': 1}
 
     @action(
         methods=['GET', 'PATCH'],
@@ -171,46 +294,174 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,)
     )
     def me_page(self, request):
+        user = load_user(request.user)
         if request.method == 'GET':
-            serializer = UserMeSerializer(request.user)
+            serializer = UserMeSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         if request.method == 'PATCH':
             serializer = UserMeSerializer(
-                request.user, data=request.data, partial=True
+                user, data=request.data, partial=True
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
+            bump_version('reviews', 'comments')
             return Response(serializer.data, status=status.HTTP_200_OK)
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        bump_version('reviews', 'comments')
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        titles = list(
+            Title.objects.filter(reviews__author=instance).values_list(
+                'id', flat=True
+            )
+        )
+        instance.delete()
+        Title.objects.filter(id__in=titles).rebuild_ratings()
+        bump_version('titles', 'catalog', 'reviews', 'comments')
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(AsyncReadMixin,
+                    QueryBudgetMixin,
+                    ParentLookupMixin,
+                    ConditionalGetMixin,
+                    ValuesReadMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, AdminModerOrReadOnly)
-    pagination_class = PageNumberPagination
+    pagination_class = KeysetPagination
+    query_budgets = {'list': 3, 'retrieve': 2}
+    parent_model = Title
+    parent_lookups = {'title_id': 'pk'}
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        return title.reviews.all()
+        return self.get_parent().reviews.select_related('author')
+
+    def get_etag_scopes(self):
+        return ('reviews', f'reviews:{self.kwargs.get("title_id")}')
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        serializer.save(author=self.request.user, title=title)
+        """Два запроса: UPDATE рейтинга заодно проверяет, что произведение
+        существует, а повторный отзыв отсекает ограничение unique_review.
+
+        Прочие нарушения целостности не выдаются за повторный отзыв: после
+        ошибки наличие отзыва автора проверяется отдельным запросом.
+        """
+        title_id = int(self.kwargs.get('title_id'))
+        try:
+            with transaction.atomic():
+                if not Title.objects.apply_score(
+                    title_id, serializer.validated_data['score'], 1
+                ):
+                    raise NotFound()
+                serializer.save(author=self.request.user, title_id=title_id)
+                bump_version('titles', f'reviews:{title_id}')
+        except IntegrityError:
+            if not Review.objects.filter(
+                author_id=self.request.user.pk, title_id=title_id
+            ).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    serializer.error_messages['already_reviewed']
+                ],
+            })
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old_score = serializer.instance.score
+        review = serializer.save()
+        if review.score != old_score:
+            Title.objects.apply_score(
+                review.title_id, review.score - old_score, 0
+            )
+        bump_version('titles', f'reviews:{review.title_id}')
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        review_id = instance.id
+        instance.delete()
+        Title.objects.apply_score(instance.title_id, -instance.score, -1)
+        bump_version(
+            'titles', f'reviews:{instance.title_id}', f'comments:{review_id}'
+        )
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(AsyncReadMixin,
+                     QueryBudgetMixin,
+                     ParentLookupMixin,
+                     ConditionalGetMixin,
+                     ValuesReadMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, AdminModerOrReadOnly)
-    pagination_class = PageNumberPagination
+    pagination_class = KeysetPagination
+    query_budgets = {'list': 3, 'retrieve': 2}
+    parent_model = Review
+    parent_lookups = {'review_id': 'pk', 'title_id': 'title_id'}
 
     def perform_create(self, serializer):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
+        review = self.get_parent()
         serializer.save(author=self.request.user, review=review)
+        bump_version(f'comments:{review.id}')
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        bump_version(f'comments:{serializer.instance.review_id}')
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        bump_version(f'comments:{instance.review_id}')
 
     def get_queryset(self):
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id)
-        return review.comments.all()
+        return self.get_parent().comments.select_related('author')
+
+    def get_etag_scopes(self):
+        return ('comments', f'comments:{self.kwargs.get("review_id")}')
+
+
+class ExportViewSet(AsyncReadMixin, viewsets.ViewSet):
+    """Потоковая выгрузка всех произведений и отзывов в NDJSON или CSV.
+
+    Строки читаются из БД кусками по `chunk_size`, поэтому расход памяти не
+    зависит от размера таблиц. Django 3.2 под ASGI перебирает потоковый
+    ответ в цикле событий, где запросы к БД запрещены, поэтому там выгрузка
+    сначала пишется во временный файл в потоке представления.
+    """
+    permission_classes = (IsAdmin,)
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+    async_actions = ('titles', 'reviews')
+    chunk_size = 500
+    spool_max_size = 1024 * 1024
+
+    def stream(self, name, fields, rows):
+        renderer = self.request.accepted_renderer
+        content = FORMATS[renderer.format](fields, rows)
+        content_type = f'{renderer.media_type}; charset={renderer.charset}'
+        filename = f'{name}.{renderer.format}'
+        if isinstance(self.request._request, ASGIRequest):
+            return FileResponse(
+                spool(content, renderer.charset, self.spool_max_size),
+                as_attachment=True, filename=filename,
+                content_type=content_type,
+            )
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=False)
+    def titles(self, request):
+        return self.stream(
+            'titles', TITLE_FIELDS, title_rows(self.chunk_size)
+        )
+
+    @action(detail=False)
+    def reviews(self, request):
+        return self.stream(
+            'reviews', REVIEW_FIELDS, review_rows(self.chunk_size)
+        )
@@ -0,0 +1,29 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с настройками соединения из OPTIONS.
+
+    `pragmas` выполняются на каждом новом соединении. `transaction_mode`
+    задаёт режим BEGIN для transaction.atomic: с IMMEDIATE транзакция
+    сразу берёт блокировку записи и при занятой базе ждёт `timeout`, а не
+    падает с «database is locked» при переходе от чтения к записи.
+    """
+    custom_options = ('pragmas', 'transaction_mode')
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for name in self.custom_options:
+            params.pop(name, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
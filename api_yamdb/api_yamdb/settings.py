@@ -67,14 +67,75 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
 # Database
+# Профиль production: журнал WAL (чтение не ждёт записи), прагмы на каждом
+# соединении, ожидание занятой базы вместо ошибки и повторное
+# использование соединений (api_yamdb.backends.sqlite3).
 
-DATABASES = {
-    'default': {
+DATABASE_NAME = os.getenv('DATABASE_NAME') or str(
+    os.path.join(BASE_DIR, "db.sqlite3")
+)
+
+DATABASE_PROFILES = {
+    'development': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': str(os.path.join(BASE_DIR, "db.sqlite3")),
-    }
+        'NAME': DATABASE_NAME,
+    },
+    'production': {
+        'ENGINE': 'api_yamdb.backends.sqlite3',
+        'NAME': DATABASE_NAME,
+        'CONN_MAX_AGE': 600,
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {
+                'journal_mode': 'WAL',
+                'synchronous': 'NORMAL',
+                'mmap_size': 256 * 1024 * 1024,
+                'cache_size': -64 * 1024,
+                'temp_store': 'MEMORY',
+            },
+        },
+    },
 }
 
+DATABASES = {
+    'default': DATABASE_PROFILES[
+        os.getenv('DATABASE_PROFILE', 'development')
+    ],
+}
+
+
+# Cache
+# Версии и ответы API хранятся в кеше, поэтому при нескольких процессах
+# нужен общий бэкенд (file или db; для db выполните createcachetable).
+
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'api_yamdb',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': (
+            os.getenv('CACHE_LOCATION') or os.path.join(BASE_DIR, 'cache')
+        ),
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.getenv('CACHE_LOCATION') or 'api_cache',
+    },
+}
+
+CACHES = {
+    'default': CACHE_BACKENDS[os.getenv('CACHE_BACKEND', 'locmem')],
+}
+
+API_CACHE_ALIAS = 'default'
+
+# ETag и 304 требуют общих для всех процессов версий данных. С LocMemCache
+# они отдаются, только если API обслуживает один процесс.
+API_SINGLE_PROCESS = os.getenv('API_SINGLE_PROCESS', 'False') == 'True'
+
 
 # Password validation
 
@@ -119,9 +180,24 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
+# Очередь писем (users.outbox): 'thread' — фоновый поток в процессе
+# приложения, 'command' — отдельный процесс `manage.py send_outbox --loop`.
+
+EMAIL_OUTBOX_DELIVERY = os.getenv('EMAIL_OUTBOX_DELIVERY', 'thread')
+
+EMAIL_OUTBOX_BATCH_SIZE = 100
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+EMAIL_OUTBOX_RETRY_DELAY = 30
+
+EMAIL_OUTBOX_LEASE = 300
+
+EMAIL_OUTBOX_POLL_INTERVAL = 30
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -129,6 +205,16 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    # Работают на orjson, если он установлен, иначе на стандартном json.
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -137,3 +223,21 @@ SIMPLE_JWT = {
 }
 
 ADMIN_EMAIL = 'admin@yamdb.com'
+
+# SQL query budgets (api.mixins.QueryBudgetMixin)
+
+QUERY_BUDGETS = {}
+
+QUERY_BUDGET_RAISE = False
+
+QUERY_BUDGET_HEADERS = DEBUG
+
+# Чтение в общем пуле потоков под ASGI (api.mixins.AsyncReadMixin);
+# asgi.py включает его через переменную окружения.
+
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+
+# Чтение произведений, отзывов и комментариев из строк .values()
+# (api.values.ValuesReadMixin) вместо ModelSerializer.
+
+VALUES_SERIALIZERS = True
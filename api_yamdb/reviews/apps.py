@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        from reviews.indexes import (create_missing_columns,
+                                     create_missing_indexes)
+        from reviews.search import create_title_search_index
+
+        post_migrate.connect(create_missing_columns, sender=self)
+        post_migrate.connect(create_missing_indexes, sender=self)
+        post_migrate.connect(create_title_search_index, sender=self)
@@ -0,0 +1,80 @@
+from django.db import connections
+from django.db.models import Index
+
+from reviews.models import Title
+
+
+def create_missing_columns(app_config, using='default', **kwargs):
+    """Добавляет в уже существующие таблицы столбцы новых полей моделей.
+
+    Столбцы добавляются через ALTER TABLE ADD COLUMN: add_field в SQLite
+    пересоздаёт таблицу из всех полей модели, поэтому не справился бы с
+    несколькими отсутствующими столбцами и удалил бы триггеры поиска. Если
+    в таблицу произведений добавлены столбцы рейтинга, рейтинг
+    пересчитывается по отзывам: значения по умолчанию ему не соответствуют.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        tables = set(connection.introspection.table_names(cursor))
+        missing = []
+        for model in app_config.get_models():
+            if not model._meta.managed or model._meta.db_table not in tables:
+                continue
+            columns = {
+                column.name
+                for column in connection.introspection.get_table_description(
+                    cursor, model._meta.db_table
+                )
+            }
+            missing += [
+                (model, field) for field in model._meta.local_concrete_fields
+                if field.column not in columns
+            ]
+    if not missing:
+        return
+    with connection.schema_editor() as editor:
+        for model, field in missing:
+            definition, params = editor.column_sql(
+                model, field, include_default=True
+            )
+            # SQLite не принимает параметры в DDL: значение по умолчанию
+            # подставляется в текст запроса.
+            definition %= tuple(map(editor.quote_value, params))
+            editor.execute(
+                f'ALTER TABLE {editor.quote_name(model._meta.db_table)} '
+                f'ADD COLUMN {editor.quote_name(field.column)} {definition}'
+            )
+    if any(model is Title for model, _ in missing):
+        Title.objects.using(using).rebuild_ratings()
+
+
+def create_missing_indexes(app_config, using='default', **kwargs):
+    """Добавляет индексы и ограничения из Meta.indexes и Meta.constraints
+    в уже существующие таблицы.
+
+    Миграций в проекте нет, а `migrate --run-syncdb` создаёт только
+    отсутствующие таблицы, поэтому новые индексы и ограничения без этого не
+    попали бы в рабочую базу. SQLite добавляет ограничение пересозданием
+    таблицы; если в ней есть нарушающие его строки, migrate завершится
+    ошибкой IntegrityError.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        tables = set(connection.introspection.table_names(cursor))
+        missing = [
+            (model, index)
+            for model in app_config.get_models()
+            if model._meta.managed and model._meta.db_table in tables
+            for index in (*model._meta.indexes, *model._meta.constraints)
+            if index.name not in connection.introspection.get_constraints(
+                cursor, model._meta.db_table
+            )
+        ]
+    if not missing:
+        return
+    with connection.schema_editor() as editor:
+        for model, index in missing:
+            if isinstance(index, Index):
+                editor.add_index(model, index)
+            else:
+                editor.add_constraint(model, index)
@@ -0,0 +1,210 @@
+import random
+from datetime import timedelta
+from itertools import accumulate, count
+
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from api.cache import bump_version
+from reviews.management.commands.process_csv import (CACHE_SCOPES,
+                                                     keep_csv_dates)
+from reviews.models import (Category, Comment, Genre,
+                            GenreTitle, Review, Title)
+from users.models import User
+
+WORDS = (
+    'тень', 'город', 'ветер', 'дорога', 'море', 'звезда', 'зима', 'огонь',
+    'сад', 'ночь', 'берег', 'птица', 'мост', 'остров', 'песня', 'сон',
+    'легенда', 'хроника', 'война', 'мир', 'память', 'голос', 'путь', 'дом',
+)
+
+
+def zipf_weights(size, skew):
+    """Накопленные веса распределения Ципфа: первые элементы популярнее."""
+    return list(accumulate(1 / rank ** skew for rank in range(1, size + 1)))
+
+
+def next_id(model):
+    return (model.objects.aggregate(value=Max('id'))['value'] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует синтетический набор данных для нагрузочного '
+        'тестирования: популярность произведений и активность '
+        'пользователей распределены по закону Ципфа.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--titles', type=int, default=5000)
+        parser.add_argument('--genres', type=int, default=20)
+        parser.add_argument('--categories', type=int, default=5)
+        parser.add_argument('--reviews', type=int, default=50000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Показатель распределения Ципфа.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['reviews'] > options['users'] * options['titles']:
+            raise CommandError(
+                'Отзывов не может быть больше, чем пар пользователь — '
+                'произведение.'
+            )
+        self.random = random.Random(options['seed'])
+        self.skew = options['skew']
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        with transaction.atomic():
+            users = self.create_users(options['users'])
+            categories = self.create_named(
+                Category, 'category', options['categories']
+            )
+            genres = self.create_named(Genre, 'genre', options['genres'])
+            titles = self.create_titles(
+                options['titles'], categories, genres
+            )
+            reviews = self.create_reviews(options['reviews'], users, titles)
+            self.create_comments(options['comments'], users, reviews)
+            Title.objects.rebuild_ratings()
+            bump_version(*CACHE_SCOPES)
+
+    def insert(self, model, objects):
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch)
+                batch = []
+        model.objects.bulk_create(batch)
+
+    def report(self, model, ids):
+        self.stdout.write(f'{model._meta.verbose_name_plural}: {len(ids)}')
+
+    def words(self, size):
+        return ' '.join(self.random.choices(WORDS, k=size))
+
+    def past_date(self, days=3 * 365):
+        return self.now - timedelta(seconds=self.random.randrange(
+            days * 24 * 60 * 60
+        ))
+
+    def create_users(self, size):
+        start = next_id(User)
+        ids = list(range(start, start + size))
+        self.insert(User, (
+            User(
+                id=user_id,
+                username=f'bench_{user_id}',
+                email=f'bench_{user_id}@yamdb.fake',
+                password='!',
+            )
+            for user_id in ids
+        ))
+        self.report(User, ids)
+        return ids
+
+    def create_named(self, model, prefix, size):
+        start = next_id(model)
+        ids = list(range(start, start + size))
+        self.insert(model, (
+            model(
+                id=obj_id,
+                name=self.words(2).capitalize(),
+                slug=f'{prefix}-{obj_id}',
+            )
+            for obj_id in ids
+        ))
+        self.report(model, ids)
+        return ids
+
+    def create_titles(self, size, categories, genres):
+        start = next_id(Title)
+        ids = list(range(start, start + size))
+        category_weights = zipf_weights(len(categories), self.skew)
+        genre_weights = zipf_weights(len(genres), self.skew)
+        self.insert(Title, (
+            Title(
+                id=title_id,
+                name=self.words(self.random.randint(1, 4)).capitalize(),
+                year=self.random.randint(1900, self.now.year),
+                description=self.words(self.random.randint(5, 40)),
+                category_id=self.random.choices(
+                    categories, cum_weights=category_weights
+                )[0],
+            )
+            for title_id in ids
+        ))
+        genre_ids = count(next_id(GenreTitle))
+        self.insert(GenreTitle, (
+            GenreTitle(id=next(genre_ids), title_id=title_id, genre_id=genre)
+            for title_id in ids
+            for genre in set(self.random.choices(
+                genres, cum_weights=genre_weights,
+                k=self.random.randint(1, 3),
+            ))
+        ))
+        self.report(Title, ids)
+        return ids
+
+    def create_reviews(self, size, users, titles):
+        start = next_id(Review)
+        ids = list(range(start, start + size))
+        user_weights = zipf_weights(len(users), self.skew)
+        title_weights = zipf_weights(len(titles), self.skew)
+        pairs = set()
+        attempts = 0
+        while len(pairs) < size:
+            attempts += 1
+            if attempts > 20 * size:
+                # Популярные пары исчерпаны, добираем равномерно.
+                user_weights = title_weights = None
+            pairs.add((
+                self.random.choices(users, cum_weights=user_weights)[0],
+                self.random.choices(titles, cum_weights=title_weights)[0],
+            ))
+        with keep_csv_dates(Review._meta.concrete_fields):
+            self.insert(Review, (
+                Review(
+                    id=review_id,
+                    author_id=author_id,
+                    title_id=title_id,
+                    text=self.words(self.random.randint(10, 80)),
+                    score=min(10, max(1, round(self.random.gauss(7, 2)))),
+                    pub_date=self.past_date(),
+                )
+                for review_id, (author_id, title_id) in zip(ids, pairs)
+            ))
+        self.report(Review, ids)
+        return ids
+
+    def create_comments(self, size, users, reviews):
+        start = next_id(Comment)
+        ids = list(range(start, start + size))
+        if not reviews:
+            return []
+        user_weights = zipf_weights(len(users), self.skew)
+        review_weights = zipf_weights(len(reviews), self.skew)
+        with keep_csv_dates(Comment._meta.concrete_fields):
+            self.insert(Comment, (
+                Comment(
+                    id=comment_id,
+                    author_id=self.random.choices(
+                        users, cum_weights=user_weights
+                    )[0],
+                    review_id=self.random.choices(
+                        reviews, cum_weights=review_weights
+                    )[0],
+                    text=self.words(self.random.randint(3, 30)),
+                    pub_date=self.past_date(days=365),
+                )
+                for comment_id in ids
+            ))
+        self.report(Comment, ids)
+        return ids
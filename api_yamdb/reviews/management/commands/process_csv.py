@@ -1,8 +1,17 @@
 import csv
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from itertools import islice
 
+import django
+from django.apps import apps
 from django.conf import settings
 from django.core.management import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
 
+from api.cache import bump_version
 from users.models import User
 from reviews.models import (Category, Comment, Genre,
                             GenreTitle, Review, Title)
@@ -18,12 +27,228 @@ FIELDS = {
     Comment: 'comments.csv',
 }
 
+CACHE_SCOPES = (
+    'categories', 'genres', 'titles', 'facets', 'catalog', 'reviews',
+    'comments',
+)
+
+
+def get_columns(model, header):
+    """Поля модели для колонок CSV: `author` и `author_id` — одно поле."""
+    return [model._meta.get_field(name) for name in header]
+
+
+def parse_row(columns, row):
+    data = {}
+    for field, value in zip(columns, row):
+        if value == '' and field.null:
+            data[field.attname] = None
+        else:
+            data[field.attname] = field.to_python(value)
+    return data
+
+
+def get_load_levels(models):
+    """Группы моделей в порядке загрузки по графу внешних ключей.
+
+    Модели одной группы не ссылаются друг на друга и грузятся параллельно.
+    """
+    dependencies = {
+        model: {
+            field.related_model for field in model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in models
+            and field.related_model is not model
+        }
+        for model in models
+    }
+    levels = []
+    loaded = set()
+    while len(loaded) < len(dependencies):
+        level = [
+            model for model, depends in dependencies.items()
+            if model not in loaded and depends <= loaded
+        ]
+        if not level:
+            raise ValueError('Циклическая зависимость между CSV-файлами.')
+        levels.append(level)
+        loaded.update(level)
+    return levels
+
+
+def read_chunks(model, path, chunk_size):
+    """Строки CSV-файла модели кусками по `chunk_size`."""
+    csv_path = os.path.join(path, FIELDS[model])
+    with open(csv_path, 'r', encoding='utf-8', newline='') as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader)
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            yield model, header, rows
+
+
+def round_robin(*iterables):
+    iterators = [iter(iterable) for iterable in iterables]
+    while iterators:
+        for iterator in list(iterators):
+            try:
+                yield next(iterator)
+            except StopIteration:
+                iterators.remove(iterator)
+
+
+def init_worker():
+    django.setup()
+    connections.close_all()
+
+
+def parse_chunk(label, header, rows):
+    """Разбирает кусок файла в процессе-воркере.
+
+    Воркер не обращается к БД: SQLite допускает одного писателя, поэтому
+    вставки из нескольких процессов выстраиваются в очередь. Значения
+    возвращаются кортежами, объекты собирает и вставляет основной процесс.
+    """
+    columns = get_columns(apps.get_model(label), header)
+    return [tuple(parse_row(columns, row).values()) for row in rows]
+
+
+def write_chunk(model, header, values, batch_size):
+    """Вставляет разобранный кусок в отдельной транзакции."""
+    columns = get_columns(model, header)
+    attnames = [field.attname for field in columns]
+    objects = [model(**dict(zip(attnames, row))) for row in values]
+    with transaction.atomic(), keep_csv_dates(columns):
+        model.objects.bulk_create(
+            objects, batch_size=batch_size, ignore_conflicts=True
+        )
+
+
+@contextmanager
+def keep_csv_dates(columns):
+    """Отключает auto_now_add, чтобы сохранить даты из файла."""
+    fields = [
+        field for field in columns if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
 
 class Command(BaseCommand):
+    help = (
+        'Потоково загружает CSV-файлы в базу пачками, по одной транзакции '
+        'на файл. Уже загруженные строки при повторном запуске пропускаются. '
+        'С --workers N куски файлов разбираются в N процессах, а вставляет '
+        'их основной процесс, по одной транзакции на кусок.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество строк в одном INSERT.',
+        )
+        parser.add_argument(
+            '--progress-every', type=int, default=100000,
+            help='Как часто (в строках) сообщать о прогрессе.',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Количество процессов для разбора CSV; вставка в БД идёт '
+                 'в одном соединении.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=50000,
+            help='Количество строк в куске для параллельной загрузки.',
+        )
 
     def handle(self, *args, **kwargs):
-        for model, data_csv in FIELDS.items():
-            csv_path = f'{settings.BASE_DIR}/static/data/{data_csv}'
-            with open(csv_path, 'r', encoding='utf-8',) as csv_file:
-                reader = csv.DictReader(csv_file)
-                model.objects.bulk_create(model(**data) for data in reader)
+        if kwargs['workers'] > 1:
+            self.load_parallel(**kwargs)
+        else:
+            for model, data_csv in FIELDS.items():
+                csv_path = os.path.join(kwargs['path'], data_csv)
+                loaded = self.load_file(
+                    model, csv_path, kwargs['batch_size'],
+                    kwargs['progress_every'],
+                )
+                self.stdout.write(f'{data_csv}: обработано строк {loaded}')
+        self.reset_sequences()
+        with transaction.atomic():
+            Title.objects.rebuild_ratings()
+            bump_version(*CACHE_SCOPES)
+
+    def load_file(self, model, csv_path, batch_size, progress_every):
+        loaded = 0
+        reported = 0
+        with open(csv_path, 'r', encoding='utf-8', newline='') as csv_file:
+            reader = csv.reader(csv_file)
+            columns = get_columns(model, next(reader))
+            with transaction.atomic(), keep_csv_dates(columns):
+                while True:
+                    batch = [
+                        model(**parse_row(columns, row))
+                        for row in islice(reader, batch_size)
+                    ]
+                    if not batch:
+                        break
+                    model.objects.bulk_create(batch, ignore_conflicts=True)
+                    loaded += len(batch)
+                    if loaded - reported >= progress_every:
+                        reported = loaded
+                        self.stdout.write(
+                            f'{os.path.basename(csv_path)}: {loaded}'
+                        )
+        return loaded
+
+    def load_parallel(self, path, workers, chunk_size, batch_size,
+                      progress_every, **kwargs):
+        connections.close_all()
+        loaded = dict.fromkeys(FIELDS.values(), 0)
+        reported = dict(loaded)
+
+        def collect(futures, pending):
+            for future in futures:
+                model, header = pending.pop(future)
+                values = future.result()
+                write_chunk(model, header, values, batch_size)
+                csv_name = FIELDS[model]
+                loaded[csv_name] += len(values)
+                if loaded[csv_name] - reported[csv_name] >= progress_every:
+                    reported[csv_name] = loaded[csv_name]
+                    self.stdout.write(f'{csv_name}: {loaded[csv_name]}')
+
+        with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+            for level in get_load_levels(list(FIELDS)):
+                chunks = round_robin(*(
+                    read_chunks(model, path, chunk_size) for model in level
+                ))
+                pending = {}
+                for model, header, rows in chunks:
+                    future = pool.submit(
+                        parse_chunk, model._meta.label, header, rows
+                    )
+                    pending[future] = (model, header)
+                    if len(pending) >= workers * 2:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done, pending)
+                collect(list(pending), pending)
+        for csv_name, count in loaded.items():
+            self.stdout.write(f'{csv_name}: обработано строк {count}')
+
+    def reset_sequences(self):
+        sql = connection.ops.sequence_reset_sql(no_style(), list(FIELDS))
+        with connection.cursor() as cursor:
+            for statement in sql:
+                cursor.execute(statement)
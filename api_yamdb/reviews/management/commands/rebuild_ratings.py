@@ -0,0 +1,15 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from api.cache import bump_version
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сумму, количество оценок и рейтинг произведений.'
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            updated = Title.objects.rebuild_ratings()
+            bump_version('titles', 'catalog')
+        self.stdout.write(f'Пересчитан рейтинг произведений: {updated}')
@@ -1,7 +1,13 @@
 from django.db import models
+from django.db.models import (Case, Count, Exists, F, OuterRef, Q, Subquery,
+                              Sum, When)
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.core.validators import (MaxValueValidator, MinValueValidator)
 
+from reviews.search import (TITLE_FTS_TABLE, MatchField, build_match_query,
+                            fts_supported)
+
 User = get_user_model()
 
 
@@ -20,6 +26,9 @@ class Category(models.Model):
         verbose_name = "Категория"
         verbose_name_plural = "Категории"
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name',), name='category_name_idx'),
+        )
 
     def __str__(self):
         return self.name
@@ -40,11 +49,111 @@ class Genre(models.Model):
         verbose_name = "Жанр"
         verbose_name_plural = "Жанры"
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name',), name='genre_name_idx'),
+        )
 
     def __str__(self):
         return self.name
 
 
+class TitleQuerySet(models.QuerySet):
+
+    def for_read(self):
+        """Произведения вместе с категорией и жанрами за фиксированное
+        число запросов."""
+        return self.select_related('category').prefetch_related(
+            models.Prefetch('genre', queryset=Genre.objects.order_by('name'))
+        )
+
+    def with_genre(self, slug):
+        """Произведения жанра `slug`.
+
+        EXISTS вместо JOIN позволяет идти по индексу сортировки
+        произведений и остановиться, набрав страницу.
+        """
+        return self.filter(Exists(GenreTitle.objects.filter(
+            title=OuterRef('pk'), genre__slug=slug
+        )))
+
+    def with_genres(self, slugs, match_all=False):
+        """Произведения с любым из жанров `slugs`, при `match_all` — со
+        всеми сразу.
+
+        Каждое условие — EXISTS по индексу (title, genre): строки не
+        дублируются, а сортировка по индексам произведений сохраняется.
+        """
+        genres = GenreTitle.objects.filter(title=OuterRef('pk'))
+        if not match_all:
+            return self.filter(Exists(genres.filter(genre__slug__in=slugs)))
+        queryset = self
+        for slug in dict.fromkeys(slugs):
+            queryset = queryset.filter(Exists(genres.filter(genre__slug=slug)))
+        return queryset
+
+    def with_categories(self, slugs):
+        """Произведения любой из категорий `slugs`.
+
+        Как и для жанров, EXISTS вместо JOIN: при нескольких категориях
+        JOIN сортировал бы страницу во временном B-дереве.
+        """
+        return self.filter(Exists(Category.objects.filter(
+            pk=OuterRef('category'), slug__in=slugs
+        )))
+
+    def search(self, text):
+        """Поиск по названию и описанию, лучшие совпадения первыми.
+
+        На SQLite использует FTS5-индекс с ранжированием bm25, на остальных
+        базах — поиск подстроки без ранжирования.
+        """
+        if not fts_supported(self.db):
+            return self.filter(
+                Q(name__icontains=text) | Q(description__icontains=text)
+            )
+        query = build_match_query(text)
+        if not query:
+            return self.none()
+        return self.filter(search_entry__document__match=query).annotate(
+            search_rank=F('search_entry__rank')
+        ).order_by('search_rank', 'id')
+
+    def apply_score(self, title_id, score_delta, count_delta):
+        """Атомарно сдвигает агрегаты рейтинга произведения."""
+        new_sum = F('rating_sum') + score_delta
+        new_count = F('rating_count') + count_delta
+        return self.filter(pk=title_id).update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            rating=Case(
+                When(rating_count__lte=-count_delta, then=None),
+                default=new_sum / new_count,
+                output_field=models.PositiveSmallIntegerField(),
+            ),
+        )
+
+    def rebuild_ratings(self):
+        """Пересчитывает агрегаты рейтинга по таблице отзывов."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(value=Sum('score')).values('value')),
+                0,
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(value=Count('id')).values('value')),
+                0,
+            ),
+            rating=Subquery(
+                reviews.annotate(
+                    value=Sum('score') / Count('id')
+                ).values('value')
+            ),
+        )
+
+
 class Title(models.Model):
     name = models.CharField(
         verbose_name='Hазвание',
@@ -73,11 +182,47 @@ class Title(models.Model):
         null=True,
         related_name='titles',
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False,
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        blank=True,
+        null=True,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Произведение"
         verbose_name_plural = "Произведения"
         ordering = ('-year', 'name')
+        indexes = (
+            models.Index(fields=('-year', 'name'), name='title_year_name_idx'),
+            models.Index(
+                fields=('category', '-year', 'name'),
+                name='title_category_year_idx',
+            ),
+            # Индексы для ?ordering=: id замыкает ORDER BY.
+            models.Index(fields=('-rating', '-id'), name='title_rating_idx'),
+            models.Index(
+                fields=('category', '-rating', '-id'),
+                name='title_category_rating_idx',
+            ),
+            models.Index(
+                fields=('-rating_count', '-id'), name='title_count_idx'
+            ),
+            models.Index(fields=('-year', '-id'), name='title_year_idx'),
+            models.Index(fields=('name', 'id'), name='title_name_idx'),
+        )
 
     def __str__(self):
         return self.name
@@ -95,10 +240,42 @@ class GenreTitle(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=['title', 'genre'],
+                name='unique_genre_title'
+            ),
+        )
+        indexes = (
+            models.Index(fields=('genre', 'title'), name='genre_title_idx'),
+        )
+
     def __str__(self):
         return f'{self.genre} {self.title}'
 
 
+class TitleSearch(models.Model):
+    """Строка FTS5-индекса произведений, только для чтения.
+
+    Таблицу и триггеры её синхронизации создаёт
+    reviews.search.create_title_search_index.
+    """
+    title = models.OneToOneField(
+        Title,
+        primary_key=True,
+        db_column='rowid',
+        on_delete=models.DO_NOTHING,
+        related_name='search_entry',
+    )
+    document = MatchField(db_column=TITLE_FTS_TABLE)
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = TITLE_FTS_TABLE
+
+
 class Review(models.Model):
     author = models.ForeignKey(
         User,
@@ -138,6 +315,11 @@ class Review(models.Model):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date'), name='review_title_date_idx'
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -174,6 +356,11 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date'), name='comment_review_date_idx'
+            ),
+        )
 
     def __str__(self):
         return f'{self.author}, {self.review}, {self.pub_date}'
@@ -0,0 +1,104 @@
+import re
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models import Lookup, TextField
+
+TITLE_FTS_TABLE = 'reviews_title_fts'
+
+TITLE_FTS_SQL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_FTS_TABLE} USING fts5(
+        name, description,
+        content='reviews_title', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_ai
+    AFTER INSERT ON reviews_title BEGIN
+        INSERT INTO {TITLE_FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_ad
+    AFTER DELETE ON reviews_title BEGIN
+        INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}, rowid, name,
+                                      description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON reviews_title BEGIN
+        INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}, rowid, name,
+                                      description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {TITLE_FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}, rank)
+    VALUES ('rank', 'bm25(10.0, 1.0)')
+    """,
+    f"INSERT INTO {TITLE_FTS_TABLE}({TITLE_FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+class MatchField(TextField):
+    """Скрытый столбец FTS5 с именем таблицы: MATCH по нему ищет по всем
+    столбцам индекса."""
+
+
+@MatchField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+@lru_cache(maxsize=None)
+def fts_supported(alias):
+    """Поддерживает ли база `alias` полнотекстовый индекс FTS5.
+
+    Поддержка зависит от библиотеки SQLite, а не от файла базы, поэтому
+    проверяется на отдельной базе в памяти: запрос не попадает в
+    соединение Django и бюджет запросов первого поиска.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'sqlite':
+        return False
+    probe = connection.Database.connect(':memory:')
+    try:
+        return bool(probe.execute(
+            "SELECT sqlite_compileoption_used('ENABLE_FTS5')"
+        ).fetchone()[0])
+    finally:
+        probe.close()
+
+
+def create_title_search_index(using='default', **kwargs):
+    """Создаёт FTS5-индекс произведений и триггеры его синхронизации.
+
+    Без таблицы произведений (migrate без --run-syncdb) ничего не делает.
+    """
+    if not fts_supported(using):
+        return
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        if TITLE_FTS_TABLE in tables or 'reviews_title' not in tables:
+            return
+        for sql in TITLE_FTS_SQL:
+            cursor.execute(sql)
+
+
+def build_match_query(text):
+    """Запрос FTS5 из пользовательской строки: все слова как префиксы."""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
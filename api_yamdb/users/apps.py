@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from users.outbox import start_sender_on_request
+
+        request_started.connect(
+            start_sender_on_request, dispatch_uid='users.outbox.sender'
+        )
@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from users.outbox import deliver_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди пачками через одно соединение. '
+        'Неотправленные письма повторяются с растущей задержкой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Количество писем в одной пачке.',
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять очередь каждые --interval '
+                 'секунд.',
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            claimed = 0
+            while True:
+                batch = deliver_outbox(options['batch_size'])
+                if not batch:
+                    break
+                claimed += batch
+            if claimed:
+                self.stdout.write(f'Обработано писем: {claimed}')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.core.mail import EmailMessage
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -60,3 +62,63 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+class ClaimsUserReadOnly(TypeError):
+    """Попытка сохранить или удалить ClaimsUser.
+
+    Запросы на запись аутентифицируются полным объектом из БД, поэтому
+    ошибка означает, что ClaimsUser попал в код записи в обход этого.
+    """
+
+
+class ClaimsUser(User):
+    """Пользователь, собранный из claims токена без обращения к БД.
+
+    Загружены только id, username, role, is_staff и is_superuser, поэтому
+    сохранять его нельзя; полный объект возвращает `load()`.
+    """
+
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise ClaimsUserReadOnly(
+            'ClaimsUser не сохраняется в БД, используйте load().'
+        )
+
+    def delete(self, *args, **kwargs):
+        raise ClaimsUserReadOnly(
+            'ClaimsUser не удаляется из БД, используйте load().'
+        )
+
+    def load(self):
+        return User.objects.get(pk=self.pk)
+
+
+class OutboxEmail(models.Model):
+    """Письмо, ожидающее отправки фоновым отправителем (users.outbox)."""
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.EmailField()
+    recipient = models.EmailField()
+    created = models.DateTimeField(auto_now_add=True)
+    next_attempt = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    sent = models.DateTimeField(null=True, blank=True)
+    claim = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+
+    def as_message(self, connection=None):
+        return EmailMessage(
+            self.subject, self.body, self.from_email, [self.recipient],
+            connection=connection,
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
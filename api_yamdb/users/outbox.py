@@ -0,0 +1,145 @@
+import logging
+import threading
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from users.models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+_wakeup = threading.Event()
+_sender = None
+_sender_lock = threading.Lock()
+
+
+def queue_email(subject, body, recipient, from_email=None):
+    """Ставит письмо в очередь в текущей транзакции.
+
+    При EMAIL_OUTBOX_DELIVERY = 'thread' после фиксации транзакции будит
+    фоновый поток отправки; при 'command' письма отправляет send_outbox.
+    """
+    email = OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.ADMIN_EMAIL,
+        recipient=recipient,
+    )
+    if settings.EMAIL_OUTBOX_DELIVERY == 'thread':
+        transaction.on_commit(wake_sender)
+    return email
+
+
+def get_pending(now):
+    return OutboxEmail.objects.filter(
+        sent__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        next_attempt__lte=now,
+    )
+
+
+def claim_batch(batch_size):
+    """Забирает пачку писем: одно письмо не достаётся двум отправителям."""
+    now = timezone.now()
+    ids = list(
+        get_pending(now).order_by('next_attempt', 'id').values_list(
+            'id', flat=True
+        )[:batch_size]
+    )
+    if not ids:
+        return []
+    token = uuid4().hex
+    lease = timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+    get_pending(now).filter(id__in=ids).update(
+        claim=token, next_attempt=now + lease
+    )
+    return list(OutboxEmail.objects.filter(claim=token))
+
+
+def reschedule(email, error):
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** email.attempts
+    email.attempts += 1
+    email.next_attempt = timezone.now() + timedelta(seconds=delay)
+    email.last_error = str(error)
+    email.claim = ''
+    email.save(update_fields=('attempts', 'next_attempt', 'last_error',
+                              'claim'))
+    logger.warning('Письмо %s не отправлено (попытка %s): %s',
+                   email.id, email.attempts, error)
+
+
+def deliver_outbox(batch_size=None):
+    """Отправляет одну пачку писем через одно соединение.
+
+    Возвращает количество взятых писем, 0 — очередь пуста.
+    """
+    batch = claim_batch(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not batch:
+        return 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        for email in batch:
+            reschedule(email, error)
+        return len(batch)
+    sent = []
+    try:
+        for email in batch:
+            try:
+                connection.send_messages([email.as_message(connection)])
+            except Exception as error:
+                reschedule(email, error)
+            else:
+                sent.append(email.id)
+    finally:
+        connection.close()
+        OutboxEmail.objects.filter(id__in=sent).update(
+            sent=timezone.now(), claim=''
+        )
+    return len(batch)
+
+
+def run_sender():
+    """Разбирает очередь при старте и затем раз в
+    EMAIL_OUTBOX_POLL_INTERVAL секунд или сразу после wake_sender()."""
+    while True:
+        try:
+            while deliver_outbox():
+                pass
+        except Exception:
+            logger.exception('Ошибка фоновой отправки писем')
+        finally:
+            close_old_connections()
+        _wakeup.wait(settings.EMAIL_OUTBOX_POLL_INTERVAL)
+        _wakeup.clear()
+
+
+def start_sender():
+    """Запускает фоновый поток отправки, если он ещё не запущен."""
+    global _sender
+    if _sender is not None and _sender.is_alive():
+        return
+    with _sender_lock:
+        if _sender is None or not _sender.is_alive():
+            _sender = threading.Thread(
+                target=run_sender, name='email-outbox', daemon=True
+            )
+            _sender.start()
+
+
+def start_sender_on_request(**kwargs):
+    """Запускает поток с первым запросом процесса: письма, оставшиеся в
+    очереди после перезапуска, уходят без нового wake_sender()."""
+    if settings.EMAIL_OUTBOX_DELIVERY == 'thread':
+        start_sender()
+
+
+def wake_sender():
+    """Запускает фоновый поток отправки, если нужно, и будит его."""
+    start_sender()
+    _wakeup.set()
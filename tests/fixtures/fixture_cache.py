@@ -0,0 +1,11 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(settings):
+    """Тесты идут в одном процессе, поэтому LocMemCache для них общий."""
+    settings.API_SINGLE_PROCESS = True
+    yield
+    for cache in caches.all():
+        cache.clear()
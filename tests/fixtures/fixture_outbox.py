@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def outbox_delivery(settings):
+    """Письма из очереди отправляет только send_outbox: фоновый поток
+    работал бы с базой параллельно с очисткой между тестами."""
+    settings.EMAIL_OUTBOX_DELIVERY = 'command'
@@ -0,0 +1,127 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08RatingAggregates:
+
+    def get_rating(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_review_changes(self, admin_client, user_client,
+                                              moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+
+        review = create_single_review(admin_client, title_id, 'a', 10).json()
+        create_single_review(user_client, title_id, 'b', 5)
+        assert self.get_rating(admin_client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        response = admin_client.patch(
+            f'{url}{review["id"]}/', data={'score': 1}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(admin_client, title_id) == 3, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки в отзыве.'
+        )
+
+        response = admin_client.delete(f'{url}{review["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(admin_client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+
+        reviews = moderator_client.get(url).json()['results']
+        moderator_client.delete(f'{url}{reviews[0]["id"]}/')
+        assert self.get_rating(admin_client, title_id) is None, (
+            'Если у произведения не осталось отзывов, `rating` должен быть '
+            '`None`.'
+        )
+
+    def test_02_rebuild_ratings_command(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'a', 8)
+        create_single_review(user_client, title_id, 'b', 3)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+
+        call_command('rebuild_ratings')
+
+        title = Title.objects.get(id=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            11, 2, 5
+        ), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает '
+            'агрегаты рейтинга по отзывам.'
+        )
+        assert Title.objects.get(id=titles[1]['id']).rating is None
+
+    def test_03_rating_columns_added_to_existing_table(self, admin_client,
+                                                       user_client):
+        from django.apps import apps
+        from django.db import connection
+
+        from reviews.indexes import (create_missing_columns,
+                                     create_missing_indexes)
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'a', 8)
+        create_single_review(user_client, title_id, 'b', 3)
+        columns = ('rating_sum', 'rating_count', 'rating')
+        with connection.schema_editor() as editor:
+            for index in Title._meta.indexes:
+                if set(index.fields) & {f'-{name}' for name in columns}:
+                    editor.remove_index(Title, index)
+            for name in columns:
+                editor.execute(f'ALTER TABLE reviews_title DROP COLUMN {name}')
+
+        config = apps.get_app_config('reviews')
+        create_missing_columns(config)
+        create_missing_indexes(config)
+        create_missing_columns(config)
+
+        title = Title.objects.get(id=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            11, 2, 5
+        ), (
+            'Проверьте, что после migrate в существующей таблице появляются '
+            'столбцы рейтинга и рейтинг пересчитывается по отзывам.'
+        )
+        assert self.get_rating(admin_client, title_id) == 5
+
+    def test_04_rebuild_ratings_bumps_version(self, admin_client):
+        from api.cache import get_version
+
+        create_titles(admin_client)
+        version = get_version('titles')
+        call_command('rebuild_ratings')
+        assert get_version('titles') != version, (
+            'Проверьте, что `rebuild_ratings` сдвигает версию кеша '
+            'произведений.'
+        )
+
+    def test_05_rating_counters_are_not_filters(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        count = client.get('/api/v1/titles/').json()['count']
+        for param in ('rating_sum', 'rating_count', 'rating'):
+            response = client.get('/api/v1/titles/', {param: 999})
+            assert response.json()['count'] == count, (
+                f'Проверьте, что служебное поле `{param}` не доступно как '
+                'фильтр произведений.'
+            )
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+def walk(client, url, link='next'):
+    ids = []
+    pages = 0
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` в курсорном режиме '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'В курсорном режиме пагинации ответ не должен содержать `count`.'
+        )
+        ids.extend(item['id'] for item in data['results'])
+        pages += 1
+        url = data[link]
+    return ids, pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09KeysetPagination:
+
+    def test_01_titles_cursor_walk(self, client):
+        from reviews.models import Title
+
+        for idx in range(7):
+            Title.objects.create(name=f'title {idx % 3}', year=2000)
+        Title.objects.create(name='old', year=1990)
+        expected = list(
+            Title.objects.order_by('-year', 'name', 'id').values_list(
+                'id', flat=True
+            )
+        )
+
+        ids, pages = walk(
+            client, '/api/v1/titles/?pagination=cursor&page_size=3'
+        )
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` отдаёт все '
+            'произведения без пропусков и повторов в порядке '
+            '`-year, name, id`.'
+        )
+        assert pages == 3
+
+        last_page = client.get(
+            '/api/v1/titles/?pagination=cursor&page_size=3'
+        ).json()
+        while last_page['next']:
+            last_page = client.get(last_page['next']).json()
+        back_ids, _ = walk(client, last_page['previous'], link='previous')
+        assert back_ids == expected[3:6] + expected[:3], (
+            'Проверьте, что ссылка `previous` в курсорном режиме возвращает '
+            'предыдущие страницы.'
+        )
+
+    def test_02_reviews_and_comments_cursor(self, admin_client, admin,
+                                            user_client, user,
+                                            moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        base = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        ids, _ = walk(admin_client, f'{base}?pagination=cursor&page_size=2')
+        assert sorted(ids) == sorted(review['id'] for review in reviews)
+        assert ids == sorted(ids, reverse=True), (
+            'Проверьте, что отзывы в курсорном режиме отсортированы по '
+            '`-pub_date` с уточнением по `id`.'
+        )
+
+        ids, _ = walk(
+            admin_client,
+            f'{base}{reviews[0]["id"]}/comments/?pagination=cursor'
+            '&page_size=1'
+        )
+        assert sorted(ids) == sorted(comment['id'] for comment in comments)
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get('/api/v1/titles/?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.fixture
+def catalog():
+    from reviews.models import Category, Genre, GenreTitle, Title
+
+    Category.objects.bulk_create(
+        Category(name=f'Категория {idx}', slug=f'category-{idx}')
+        for idx in range(3)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(5)
+    )
+    categories = list(Category.objects.all())
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {idx}',
+            year=1900 + idx,
+            category=categories[idx % len(categories)],
+        )
+        for idx in range(120)
+    )
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title_id=title_id, genre=genres[(title_id + shift) % 5])
+        for title_id in Title.objects.values_list('id', flat=True)
+        for shift in range(2)
+    )
+    return Title.objects.order_by('-year', 'name').first()
+
+
+@pytest.mark.django_db
+class Test10TitleQueries:
+
+    def test_01_title_list_query_count(self, client, catalog,
+                                       django_assert_num_queries):
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/?page_size=100')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert len(results) == 100
+        assert len(results[0]['genre']) == 2, (
+            'Проверьте, что для произведений в списке выводятся все жанры.'
+        )
+        assert results[0]['category']['slug'] == catalog.category.slug
+
+    def test_02_title_detail_query_count(self, client, catalog,
+                                         django_assert_num_queries):
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{catalog.id}/')
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['genre']) == 2
+
+    @pytest.mark.parametrize('values', (True, False))
+    def test_03_title_genres_ordered_by_name(self, client, settings,
+                                             values):
+        from reviews.models import Genre, Title
+
+        settings.VALUES_SERIALIZERS = values
+        genres = [
+            Genre.objects.create(name=name, slug=f'order-{idx}')
+            for idx, name in enumerate(('Фэнтези', 'Драма', 'Комедия'))
+        ]
+        title = Title.objects.create(name='Порядок', year=2000)
+        title.genre.set(genres)
+        expected = ['Драма', 'Комедия', 'Фэнтези']
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{title.id}/'):
+            data = client.get(url).json()
+            data = data['results'][0] if 'results' in data else data
+            assert [genre['name'] for genre in data['genre']] == expected, (
+                f'Проверьте, что `{url}` выводит жанры произведения '
+                'по названию.'
+            )
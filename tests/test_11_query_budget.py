@@ -0,0 +1,72 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11QueryBudget:
+
+    def test_01_read_endpoints_fit_budgets(self, settings, client,
+                                           admin_client, admin, user_client,
+                                           user, moderator_client, moderator):
+        settings.QUERY_BUDGET_RAISE = True
+        settings.QUERY_BUDGET_HEADERS = True
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[0]["id"]}/'
+        urls = (
+            '/api/v1/categories/',
+            '/api/v1/genres/',
+            '/api/v1/titles/',
+            title_url,
+            f'{title_url}reviews/',
+            review_url,
+            f'{review_url}comments/',
+            f'{review_url}comments/{comments[0]["id"]}/',
+        )
+        for url in urls:
+            for api_client in (client, admin_client):
+                response = api_client.get(url)
+                assert response.status_code == HTTPStatus.OK
+                assert 'X-Query-Budget' in response, (
+                    f'Проверьте, что для GET-запроса к `{url}` задан бюджет '
+                    'SQL-запросов.'
+                )
+                count = (
+                    int(response['X-Query-Count'])
+                    - int(response['X-Query-Auth-Count'])
+                )
+                assert count <= int(response['X-Query-Budget']), (
+                    f'Проверьте, что GET-запрос к `{url}` укладывается в '
+                    'бюджет SQL-запросов.'
+                )
+                assert float(response['X-Query-Time']) >= 0
+
+    def test_02_budget_overrun_raises_or_logs(self, settings, client, caplog):
+        from api.mixins import QueryBudgetExceeded
+
+        settings.QUERY_BUDGET_RAISE = True
+        settings.QUERY_BUDGETS = {'TitleViewSet.list': 0}
+        with pytest.raises(QueryBudgetExceeded):
+            client.get('/api/v1/titles/')
+
+        settings.QUERY_BUDGET_RAISE = False
+        with caplog.at_level(logging.WARNING, logger='api.mixins'):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert any(
+            'TitleViewSet.list' in record.getMessage()
+            and 'при бюджете 0' in record.getMessage()
+            for record in caplog.records
+        ), (
+            'Проверьте, что превышение бюджета без QUERY_BUDGET_RAISE '
+            'записывается в лог предупреждением.'
+        )
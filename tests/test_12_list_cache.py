@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ListCache:
+
+    @pytest.mark.parametrize('url', ('/api/v1/categories/', '/api/v1/genres/'))
+    def test_01_list_is_cached_and_invalidated(self, url, client,
+                                               admin_client,
+                                               django_assert_num_queries):
+        data = {'name': 'Фильм', 'slug': 'films'}
+        assert admin_client.post(url, data=data).status_code == (
+            HTTPStatus.CREATED
+        )
+        first = client.get(url, {'search': 'Фил'}).json()
+        with django_assert_num_queries(0):
+            cached = client.get(url, {'search': 'Фил'}).json()
+        assert cached == first, (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из кеша.'
+        )
+        assert client.get(url, {'search': 'нет'}).json()['count'] == 0, (
+            'Проверьте, что ключ кеша учитывает строку запроса.'
+        )
+
+        admin_client.post(url, data={'name': 'Фильмы', 'slug': 'films-2'})
+        assert client.get(url, {'search': 'Фил'}).json()['count'] == 2, (
+            f'Проверьте, что создание объекта через `{url}` сбрасывает кеш.'
+        )
+        admin_client.delete(f'{url}films/')
+        assert client.get(url, {'search': 'Фил'}).json()['count'] == 1, (
+            f'Проверьте, что удаление объекта через `{url}` сбрасывает кеш.'
+        )
+
+    def test_02_key_includes_origin(self, client, admin_client):
+        url = '/api/v1/genres/'
+        for number in range(6):
+            admin_client.post(url, data={
+                'name': f'Жанр {number}', 'slug': f'genre-{number}'
+            })
+        params = {'search': 'Жанр'}
+        first = client.get(url, params, HTTP_HOST='evil.example').json()
+        assert first['next'].startswith('http://evil.example/')
+
+        response = client.get(url, params).json()
+        assert response['next'].startswith('http://testserver/'), (
+            'Проверьте, что ключ кеша списка учитывает хост запроса: ссылки '
+            'next/previous не должны браться из ответа для другого хоста.'
+        )
+        response = client.get(url, params, secure=True).json()
+        assert response['next'].startswith('https://testserver/'), (
+            'Проверьте, что ключ кеша списка учитывает схему запроса.'
+        )
+
+    def test_03_no_cache_without_shared_versions(self, client, settings):
+        from api.cache import cache_is_shared
+        from reviews.models import Genre
+
+        settings.API_SINGLE_PROCESS = False
+        assert not cache_is_shared()
+        url = '/api/v1/genres/'
+        assert client.get(url).json()['count'] == 0
+        Genre.objects.create(name='Драма', slug='drama')
+        assert client.get(url).json()['count'] == 1, (
+            'Проверьте, что без общего для процессов кеша списки не '
+            'кешируются: другой процесс может не знать о записи.'
+        )
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    def search(self, client, text):
+        response = client.get('/api/v1/titles/', {'search': text})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_is_ranked_and_synced(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name='Крепкий орешек', year=1988,
+            description='Полицейский против террористов'
+        )
+        Title.objects.create(
+            name='Терминатор', year=1984,
+            description='Киборг из будущего и полицейский участок'
+        )
+        Title.objects.create(name='Полицейская академия', year=1984)
+
+        assert self.search(client, 'полицейск')[0] == (
+            'Полицейская академия'
+        ), (
+            'Проверьте, что поиск `search` ранжирует совпадения в названии '
+            'выше совпадений в описании.'
+        )
+        assert len(self.search(client, 'полицейск')) == 3
+        assert self.search(client, 'КИБОРГ') == ['Терминатор']
+        assert self.search(client, '!!!') == []
+
+        title = Title.objects.get(name='Терминатор')
+        title.name = 'Терминатор 2'
+        title.description = 'Судный день'
+        title.save()
+        assert self.search(client, 'киборг') == []
+        assert self.search(client, 'судный') == ['Терминатор 2'], (
+            'Проверьте, что индекс поиска обновляется при изменении '
+            'произведения.'
+        )
+
+        title.delete()
+        assert self.search(client, 'судный') == []
+
+    def test_02_search_with_cursor_pagination(self, client):
+        from reviews.models import Title
+
+        for idx in range(5):
+            Title.objects.create(name=f'Сага часть {idx}', year=2000)
+        response = client.get(
+            '/api/v1/titles/',
+            {'search': 'сага', 'pagination': 'cursor', 'page_size': 2}
+        )
+        ids = [title['id'] for title in response.json()['results']]
+        while response.json()['next']:
+            response = client.get(response.json()['next'])
+            ids.extend(title['id'] for title in response.json()['results'])
+        assert sorted(ids) == sorted(
+            Title.objects.values_list('id', flat=True)
+        )
+
+    def test_03_single_match_per_query(self, client):
+        from django.db import connection
+
+        from reviews.models import Title
+
+        for idx in range(3):
+            Title.objects.create(name=f'Сага часть {idx}', year=2000)
+        queryset = Title.objects.search('сага')
+        sql, params = queryset.query.sql_with_params()
+        assert sql.count(' MATCH ') == 1, (
+            'Проверьте, что поиск выполняет MATCH один раз, а ранг берёт из '
+            'той же строки индекса.'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = [row[-1] for row in cursor.fetchall()]
+        assert not any('CORRELATED' in detail for detail in plan), plan
+        assert [title.search_rank < 0 for title in queryset] == [True] * 3
+
+    def test_04_first_search_fits_budget(self, settings, client):
+        from reviews.models import Title
+        from reviews.search import fts_supported
+
+        Title.objects.create(name='Терминатор', year=1984)
+        settings.QUERY_BUDGET_RAISE = True
+        fts_supported.cache_clear()
+        assert self.search(client, 'терминатор') == ['Терминатор'], (
+            'Проверьте, что первый поиск после запуска процесса укладывается '
+            'в бюджет SQL-запросов.'
+        )
@@ -0,0 +1,177 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.http import HttpResponse
+
+from tests.utils import (create_comments, create_single_review,
+                         create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ConditionalGet:
+
+    def test_01_reviews_etag(self, client, admin_client, admin, user_client,
+                             user, moderator_client, moderator,
+                             django_assert_num_queries):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+        )
+        with django_assert_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304, проверив '
+            'только существование произведения.'
+        )
+        assert client.get(url, {'page': 1}, HTTP_IF_NONE_MATCH=etag)[
+            'ETag'
+        ] != etag
+
+        create_single_review(moderator_client, titles[0]['id'], 'new', 3)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после создания отзыва ETag списка меняется.'
+        )
+        etag = response['ETag']
+
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'text': 'x'})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва ETag списка меняется.'
+        )
+
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(title_url)['ETag']
+        assert client.get(
+            title_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+        admin_client.patch(f'{url}{reviews[0]["id"]}/', data={'score': 1})
+        assert client.get(
+            title_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение оценки меняет ETag произведения.'
+        )
+
+        comments_url = f'{url}{reviews[0]["id"]}/comments/'
+        etag = client.get(comments_url)['ETag']
+        assert client.get(
+            comments_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+        user_client.delete(f'{comments_url}{comments[1]["id"]}/')
+        assert client.get(
+            comments_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление комментария меняет ETag списка.'
+        )
+
+    def test_02_last_modified(self, client):
+        from api.cache import get_cache
+
+        client.get('/api/v1/titles/')
+        get_cache().set('modified:titles', (int(time.time()) - 10) * 10 ** 9)
+        response = client.get('/api/v1/titles/')
+        last_modified = response['Last-Modified']
+        assert last_modified, (
+            'Проверьте, что ответ на GET-запрос к `/api/v1/titles/` содержит '
+            '`Last-Modified`.'
+        )
+        response = client.get(
+            '/api/v1/titles/', HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    def test_03_no_validators_without_shared_cache(self, client, settings,
+                                                   tmp_path):
+        from api.cache import cache_is_shared
+
+        settings.API_SINGLE_PROCESS = False
+        assert not cache_is_shared()
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        assert not response.has_header('ETag'), (
+            'Проверьте, что без общего для процессов кеша ETag не отдаётся: '
+            'другой процесс может не знать о записи.'
+        )
+        assert not response.has_header('Last-Modified')
+
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        }}
+        assert cache_is_shared()
+        etag = client.get('/api/v1/titles/')['ETag']
+        assert client.get(
+            '/api/v1/titles/', HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что с общим кешем ETag отдаётся и без '
+            'API_SINGLE_PROCESS.'
+        )
+
+    def test_04_missing_resource_is_not_modified(self, client, admin_client):
+        from datetime import datetime, timedelta, timezone
+
+        from django.utils.http import http_date
+
+        future = http_date(
+            (datetime.now(timezone.utc) + timedelta(days=1)).timestamp()
+        )
+        for url in ('/api/v1/titles/999999/',
+                    '/api/v1/titles/999999/reviews/'):
+            for headers in ({'HTTP_IF_NONE_MATCH': '*'},
+                            {'HTTP_IF_MODIFIED_SINCE': future}):
+                response = client.get(url, **headers)
+                assert response.status_code == HTTPStatus.NOT_FOUND, (
+                    f'Проверьте, что GET-запрос к несуществующему `{url}` с '
+                    'условными заголовками возвращает 404, а не 304.'
+                )
+
+    def test_05_title_etag_ignores_other_titles(self, client, admin_client,
+                                                user_client):
+        titles, _, _ = create_titles(admin_client)
+        first_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(first_url)['ETag']
+        create_single_review(user_client, titles[1]['id'], 'Текст', 5)
+        assert client.get(
+            first_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что отзыв на другое произведение не меняет ETag '
+            'произведения.'
+        )
+        admin_client.patch(first_url, data={'name': 'Новое'})
+        assert client.get(
+            first_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение произведения меняет его ETag.'
+        )
+        etag = client.get(first_url)['ETag']
+        admin_client.post('/api/v1/titles/', data=[
+            {'id': titles[0]['id'], 'name': 'Массово', 'year': 2000,
+             'genre': titles[0]['genre'], 'category': titles[0]['category']},
+        ], format='json')
+        assert client.get(
+            first_url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что массовое изменение произведения меняет его ETag.'
+        )
+
+    def test_06_no_scopes_no_validators(self, rf):
+        from api.cache import ConditionalGetMixin
+
+        class View(ConditionalGetMixin):
+            def get(self, request):
+                return self.get_conditional_response(
+                    lambda request: HttpResponse('ok'), request
+                )
+
+        response = View().get(rf.get('/'))
+        assert response.status_code == HTTPStatus.OK
+        assert not response.has_header('ETag'), (
+            'Проверьте, что без областей версий ETag не отдаётся.'
+        )
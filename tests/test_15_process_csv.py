@@ -0,0 +1,136 @@
+import csv
+import os
+import sqlite3
+import subprocess
+import sys
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from tests.conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(filename):
+    with open(os.path.join(DATA_PATH, filename), encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+def manage(database, *args):
+    """Команда manage.py в отдельном процессе с файловой БД `database`."""
+    return subprocess.run(
+        [sys.executable, 'manage.py', *args],
+        cwd=MANAGE_PATH, capture_output=True, text=True, check=True,
+        env={
+            **os.environ,
+            'DATABASE_NAME': str(database),
+            'DATABASE_PROFILE': 'production',
+        },
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ProcessCsv:
+
+    def test_01_import_is_idempotent(self):
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+
+        out = StringIO()
+        call_command(
+            'process_csv', '--path', DATA_PATH, '--batch-size', '7',
+            stdout=out
+        )
+        assert 'review.csv' in out.getvalue(), (
+            'Проверьте, что `process_csv` сообщает о прогрессе загрузки.'
+        )
+        counts = {
+            User: count_rows('users.csv'),
+            Title: count_rows('titles.csv'),
+            Review: count_rows('review.csv'),
+            Comment: count_rows('comments.csv'),
+        }
+        for model, expected in counts.items():
+            assert model.objects.count() == expected
+
+        call_command('process_csv', '--path', DATA_PATH, stdout=StringIO())
+        for model, expected in counts.items():
+            assert model.objects.count() == expected, (
+                'Проверьте, что повторный запуск `process_csv` не создаёт '
+                'дубликатов.'
+            )
+
+        review = Review.objects.get(id=1)
+        assert review.author_id == 100
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что `process_csv` сохраняет даты из CSV-файлов.'
+        )
+        title = Title.objects.get(id=review.title_id)
+        assert title.rating_count == title.reviews.count()
+
+    def test_02_parallel_import(self):
+        from reviews.models import Comment, Review
+
+        call_command(
+            'process_csv', '--path', DATA_PATH, '--workers', '3',
+            '--chunk-size', '10', stdout=StringIO(), stderr=StringIO()
+        )
+        assert Review.objects.count() == count_rows('review.csv'), (
+            'Проверьте, что `process_csv --workers N` загружает все строки.'
+        )
+        assert Comment.objects.count() == count_rows('comments.csv')
+
+    def test_03_load_levels_follow_foreign_keys(self):
+        from reviews.management.commands.process_csv import (
+            FIELDS, get_load_levels)
+        from reviews.models import (Category, Comment, Genre, GenreTitle,
+                                    Review, Title)
+        from users.models import User
+
+        levels = [set(level) for level in get_load_levels(list(FIELDS))]
+        assert levels == [
+            {User, Category, Genre},
+            {Title},
+            {GenreTitle, Review},
+            {Comment},
+        ], (
+            'Проверьте, что файлы группируются для загрузки по графу '
+            'внешних ключей моделей.'
+        )
+
+    def test_04_parallel_import_into_file_database(self, tmp_path):
+        database = tmp_path / 'db.sqlite3'
+        manage(database, 'migrate', '--run-syncdb', '--verbosity', '0')
+        tables = {
+            'users_user': count_rows('users.csv'),
+            'reviews_title': count_rows('titles.csv'),
+            'reviews_genretitle': count_rows('genre_title.csv'),
+            'reviews_review': count_rows('review.csv'),
+            'reviews_comment': count_rows('comments.csv'),
+        }
+
+        for run in range(2):
+            manage(
+                database, 'process_csv', '--path', DATA_PATH,
+                '--workers', '2', '--chunk-size', '10',
+            )
+            with sqlite3.connect(database) as db:
+                counts = {
+                    table: db.execute(
+                        f'SELECT COUNT(*) FROM {table}'
+                    ).fetchone()[0]
+                    for table in tables
+                }
+                unrated = db.execute(
+                    'SELECT COUNT(*) FROM reviews_title WHERE rating_count '
+                    '!= (SELECT COUNT(*) FROM reviews_review '
+                    'WHERE title_id = reviews_title.id)'
+                ).fetchone()[0]
+            assert counts == tables, (
+                'Проверьте, что `process_csv --workers N` загружает все '
+                'строки, а повторный запуск не создаёт дубликатов '
+                f'(запуск {run + 1}).'
+            )
+            assert unrated == 0
@@ -0,0 +1,49 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class Test16Benchmark:
+
+    def test_01_generate_dataset_and_benchmark(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+        from users.models import User
+
+        call_command(
+            'generate_dataset', '--users', '20', '--titles', '30',
+            '--genres', '4', '--categories', '3', '--reviews', '100',
+            '--comments', '150', stdout=StringIO()
+        )
+        assert User.objects.count() == 20
+        assert Title.objects.count() == 30
+        assert Review.objects.count() == 100
+        assert Comment.objects.count() == 150
+        assert sum(
+            Title.objects.values_list('rating_count', flat=True)
+        ) == 100, (
+            'Проверьте, что `generate_dataset` пересчитывает рейтинги.'
+        )
+
+        report_path = tmp_path / 'bench.json'
+        out = StringIO()
+        call_command(
+            'benchmark', '--requests', '3', '--warmup', '1',
+            '--json', str(report_path), stdout=out, stderr=StringIO()
+        )
+        report = json.loads(report_path.read_text(encoding='utf-8'))
+        scenarios = {result['scenario'] for result in report['results']}
+        assert scenarios == {
+            'titles', 'titles_filtered', 'reviews', 'comments',
+            'review_create', 'signup', 'token',
+        }
+        for result in report['results']:
+            assert result['requests'] == 3
+            assert result['p50_ms'] <= result['p99_ms']
+            assert result['queries_per_request'] > 0
+        assert Review.objects.count() == 100, (
+            'Проверьте, что бенчмарк откатывает записи.'
+        )
+        assert 'p95_ms' in out.getvalue()
@@ -0,0 +1,46 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, override_settings
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17AsyncReads:
+
+    def test_01_read_actions_are_async(self, admin_client):
+        from api.views import TitleViewSet
+
+        titles, _, _ = create_titles(admin_client)
+        with override_settings(ASYNC_READ_VIEWS=True):
+            view = TitleViewSet.as_view({'get': 'list', 'post': 'create'})
+        assert asyncio.iscoroutinefunction(view), (
+            'Проверьте, что при ASYNC_READ_VIEWS = True вьюсет произведений '
+            'отдаёт асинхронное представление.'
+        )
+        assert getattr(view, 'csrf_exempt', False)
+
+        request = RequestFactory().get('/api/v1/titles/')
+        response = async_to_sync(view)(request)
+        assert response.status_code == HTTPStatus.OK
+        assert response.is_rendered, (
+            'Проверьте, что ответ на чтение рендерится в потоке пула.'
+        )
+        assert response.data['count'] == len(titles)
+
+        request = RequestFactory().post('/api/v1/titles/', {})
+        assert async_to_sync(view)(request).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_02_sync_by_default(self):
+        from api.views import TitleViewSet
+
+        with override_settings(ASYNC_READ_VIEWS=False):
+            view = TitleViewSet.as_view({'get': 'list'})
+        assert not asyncio.iscoroutinefunction(view), (
+            'Проверьте, что без ASYNC_READ_VIEWS представление синхронное.'
+        )
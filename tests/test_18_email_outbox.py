@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18EmailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    def test_01_signup_queues_email(self, client):
+        from users.models import OutboxEmail
+
+        data = {'email': 'outbox@yamdb.fake', 'username': 'outbox'}
+        response = client.post(self.url_signup, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что регистрация не отправляет письмо в запросе.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipient == data['email'], (
+            'Проверьте, что регистрация ставит письмо в очередь.'
+        )
+
+        call_command('send_outbox')
+        assert [message.to for message in mail.outbox] == [[data['email']]]
+        email.refresh_from_db()
+        assert email.sent is not None and email.claim == ''
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    def test_02_retry_with_backoff(self, settings):
+        from users.models import OutboxEmail
+        from users.outbox import deliver_outbox, queue_email
+
+        settings.EMAIL_BACKEND = f'{__name__}.FailingBackend'
+        email = queue_email('Тема', 'Текст', 'retry@yamdb.fake')
+
+        assert deliver_outbox() == 1
+        email.refresh_from_db()
+        assert email.attempts == 1 and email.sent is None
+        assert email.next_attempt > timezone.now(), (
+            'Проверьте, что неотправленное письмо откладывается.'
+        )
+        assert 'SMTP' in email.last_error
+        assert deliver_outbox() == 0, (
+            'Проверьте, что отложенное письмо не отправляется до срока.'
+        )
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        OutboxEmail.objects.update(next_attempt=timezone.now())
+        assert deliver_outbox() == 1
+        assert len(mail.outbox) == 1
+        assert OutboxEmail.objects.filter(sent__isnull=False).count() == 1
+
+        email = queue_email('Тема', 'Текст', 'dead@yamdb.fake')
+        OutboxEmail.objects.filter(id=email.id).update(
+            attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        )
+        assert deliver_outbox() == 0, (
+            'Проверьте, что после исчерпания попыток письмо не отправляется.'
+        )
+
+    def test_03_sender_drains_on_start_and_polls(self, monkeypatch,
+                                                 settings):
+        from users import outbox
+
+        class Stop(Exception):
+            pass
+
+        calls = []
+        waits = []
+
+        def fake_wait(timeout):
+            waits.append(timeout)
+            if len(waits) == 2:
+                raise Stop
+            return False
+
+        monkeypatch.setattr(outbox, 'deliver_outbox',
+                            lambda: calls.append(len(waits)) or 0)
+        monkeypatch.setattr(outbox, 'close_old_connections', lambda: None)
+        monkeypatch.setattr(outbox._wakeup, 'wait', fake_wait)
+        settings.EMAIL_OUTBOX_POLL_INTERVAL = 7
+
+        with pytest.raises(Stop):
+            outbox.run_sender()
+        assert calls == [0, 1], (
+            'Проверьте, что фоновый поток разбирает очередь сразу после '
+            'запуска, а затем после каждого ожидания.'
+        )
+        assert waits == [7, 7], (
+            'Проверьте, что фоновый поток проверяет очередь каждые '
+            'EMAIL_OUTBOX_POLL_INTERVAL секунд.'
+        )
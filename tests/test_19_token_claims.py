@@ -0,0 +1,112 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from rest_framework.test import APIClient
+
+from users.models import ClaimsUser, ClaimsUserReadOnly
+
+
+def get_claims_client(client, user):
+    response = client.post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    claims_client = APIClient()
+    claims_client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+    )
+    return claims_client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TokenClaims:
+
+    def test_01_permissions_without_user_query(self, client, admin, user,
+                                               django_assert_num_queries):
+        admin_client = get_claims_client(client, admin)
+        user_client = get_claims_client(client, user)
+
+        with django_assert_num_queries(2):
+            response = admin_client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что администратор с токеном из `/api/v1/auth/token/` '
+            'получает список пользователей без загрузки своей записи из БД.'
+        )
+        with django_assert_num_queries(0):
+            response = user_client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что роль из токена учитывается в правах доступа.'
+        )
+
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_02_objects_need_the_real_user(self, client, admin, user):
+        admin_client = get_claims_client(client, admin)
+        user_client = get_claims_client(client, user)
+
+        response = user_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что `/api/v1/users/me/` возвращает данные из БД.'
+        )
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'first_name': 'Имя'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.first_name == 'Имя' and user.bio == 'user bio', (
+            'Проверьте, что PATCH-запрос к `/api/v1/users/me/` не затирает '
+            'незагруженные из токена поля.'
+        )
+
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        title = admin_client.post('/api/v1/titles/', data={
+            'name': 'Фильм', 'year': 2000, 'category': 'films',
+        }).json()
+        url = f'/api/v1/titles/{title["id"]}/reviews/'
+        response = user_client.post(url, data={'text': 'Текст', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['author'] == user.username
+        review_url = f'{url}{response.json()["id"]}/'
+        assert user_client.patch(
+            review_url, data={'text': 'Новый'}
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что автор с токеном из claims может изменить отзыв.'
+        )
+        assert admin_client.delete(review_url).status_code == (
+            HTTPStatus.NO_CONTENT
+        )
+
+    def test_03_writes_check_the_real_user(self, client, admin, user):
+        admin_client = get_claims_client(client, admin)
+        user_client = get_claims_client(client, user)
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        title = admin_client.post('/api/v1/titles/', data={
+            'name': 'Фильм', 'year': 2000, 'category': 'films',
+        }).json()
+        url = f'/api/v1/titles/{title["id"]}/reviews/'
+
+        user.is_active = False
+        user.save()
+        response = user_client.post(url, data={'text': 'Текст', 'score': 5})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что запрос на запись с токеном из claims отклоняется, '
+            'если пользователь деактивирован.'
+        )
+        assert user_client.get(url).status_code == HTTPStatus.OK
+
+    def test_04_claims_user_is_read_only(self, user):
+        claims_user = ClaimsUser(id=user.pk, username=user.username)
+        with pytest.raises(ClaimsUserReadOnly):
+            claims_user.save()
+        with pytest.raises(ClaimsUserReadOnly):
+            claims_user.delete()
+        assert claims_user.load() == user
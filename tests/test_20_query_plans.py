@@ -0,0 +1,73 @@
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20QueryPlans:
+
+    def test_01_viewset_queries_use_indexes(self):
+        from reviews.models import Title
+
+        call_command('check_query_plans')
+        assert not Title.objects.exists(), (
+            'Проверьте, что check_query_plans не оставляет тестовых объектов.'
+        )
+
+    def test_02_problems_detected(self):
+        from api.management.commands.check_query_plans import get_problems
+
+        sql = 'SELECT * FROM "reviews_review" ORDER BY "text"'
+        assert get_problems(sql, [
+            'SCAN reviews_review', 'USE TEMP B-TREE FOR ORDER BY',
+        ]) == ['SCAN reviews_review', 'USE TEMP B-TREE FOR ORDER BY']
+        assert get_problems(f'{sql} LIMIT 5', ['SCAN reviews_review']) == []
+        prefetch = (
+            'SELECT * FROM "reviews_genre" INNER JOIN "reviews_genretitle" '
+            'ON ("reviews_genre"."id" = "reviews_genretitle"."genre_id") '
+            'WHERE "reviews_genretitle"."title_id" IN (%s, %s) '
+            'ORDER BY "reviews_genre"."name" ASC'
+        )
+        assert get_problems(prefetch, ['USE TEMP B-TREE FOR ORDER BY']) == [], (
+            'Проверьте, что сортировка prefetch-запроса по ключам страницы '
+            'не считается проблемой.'
+        )
+        assert get_problems(
+            prefetch.replace(' IN (%s, %s)', ' > %s'),
+            ['USE TEMP B-TREE FOR ORDER BY'],
+        ) == ['USE TEMP B-TREE FOR ORDER BY']
+
+    def test_03_missing_indexes_created(self):
+        from reviews.indexes import create_missing_indexes
+        from reviews.models import Review
+
+        index = Review._meta.indexes[0]
+        with connection.schema_editor() as editor:
+            editor.remove_index(Review, index)
+        create_missing_indexes(apps.get_app_config('reviews'))
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Review._meta.db_table
+            )
+        assert index.name in constraints, (
+            'Проверьте, что индексы из Meta.indexes создаются в существующих '
+            'таблицах после migrate.'
+        )
+
+    def test_04_missing_constraints_created(self):
+        from reviews.indexes import create_missing_indexes
+        from reviews.models import GenreTitle
+
+        constraint = GenreTitle._meta.constraints[0]
+        with connection.schema_editor() as editor:
+            editor.remove_constraint(GenreTitle, constraint)
+        create_missing_indexes(apps.get_app_config('reviews'))
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, GenreTitle._meta.db_table
+            )
+        assert constraints.get(constraint.name, {}).get('unique'), (
+            'Проверьте, что ограничения из Meta.constraints создаются в '
+            'существующих таблицах после migrate.'
+        )
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+
+def get_token_client(user):
+    from api.authentication import RoleAccessToken
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ReviewCreate:
+
+    def test_01_single_round_trip(self, admin_client, user,
+                                  django_assert_max_num_queries):
+        from reviews.models import Review, Title
+
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        title = admin_client.post('/api/v1/titles/', data={
+            'name': 'Фильм', 'year': 2000, 'category': 'films',
+        }).json()
+        url = f'/api/v1/titles/{title["id"]}/reviews/'
+        client = get_token_client(user)
+        data = {'text': 'Текст', 'score': 7}
+
+        with django_assert_max_num_queries(4) as context:
+            response = client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        assert len(selects) == 1 and 'FROM "users_user"' in selects[0], (
+            'Проверьте, что при создании отзыва читается только автор '
+            '(проверка `is_active`): произведение проверяет UPDATE рейтинга, '
+            f'повтор — ограничение unique_review. Выполнено: {selects}'
+        )
+        assert response.json()['title'] == title['id']
+        assert response.json()['author'] == user.username
+
+        response = client.post(url, data={'text': 'Ещё', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставляли отзыв на это произведение']
+        }
+        rating = Title.objects.values_list(
+            'rating_sum', 'rating_count', 'rating'
+        ).get(id=title['id'])
+        assert rating == (7, 1, 7), (
+            'Проверьте, что отклонённый отзыв не меняет рейтинг произведения.'
+        )
+
+        response = client.post('/api/v1/titles/0/reviews/', data=data)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert Review.objects.count() == 1
+
+    def test_02_other_integrity_errors_not_masked(self, admin_client, user,
+                                                  monkeypatch):
+        from django.db import IntegrityError
+
+        from api.serializers import ReviewSerializer
+        from reviews.models import Title
+
+        admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        title = admin_client.post('/api/v1/titles/', data={
+            'name': 'Фильм', 'year': 2000, 'category': 'films',
+        }).json()
+
+        def save(self, **kwargs):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        monkeypatch.setattr(ReviewSerializer, 'save', save)
+        client = get_token_client(user)
+        with pytest.raises(IntegrityError):
+            client.post(
+                f'/api/v1/titles/{title["id"]}/reviews/',
+                data={'text': 'Текст', 'score': 7},
+            )
+        assert Title.objects.get(id=title['id']).rating_count == 0, (
+            'Проверьте, что при ошибке создания отзыва рейтинг не меняется.'
+        )
@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22NestedParents:
+
+    def test_01_url_chain_is_validated(self, admin_client, admin,
+                                       user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        review_id = reviews[0]['id']
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{review_id}/comments/'
+        wrong_url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{review_id}/comments/'
+        )
+
+        assert admin_client.get(url).status_code == HTTPStatus.OK
+        for response in (
+            admin_client.get(wrong_url),
+            admin_client.get(f'{wrong_url}{comments[0]["id"]}/'),
+            admin_client.post(wrong_url, data={'text': 'Текст'}),
+            admin_client.delete(f'{wrong_url}{comments[0]["id"]}/'),
+        ):
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что комментарии отзыва недоступны по адресу с '
+                'чужим произведением.'
+            )
+
+    def test_02_parent_is_resolved_once(self, admin_client, admin,
+                                        django_assert_num_queries):
+        from api.views import CommentViewSet
+
+        _, reviews, titles = create_comments(admin_client, {
+            admin: admin_client,
+        })
+        view = CommentViewSet(kwargs={
+            'title_id': str(titles[0]['id']),
+            'review_id': str(reviews[0]['id']),
+        })
+        with django_assert_num_queries(1):
+            review = view.get_parent()
+            assert view.get_parent() is review
+            assert review.title_id == titles[0]['id']
+            view.get_queryset()
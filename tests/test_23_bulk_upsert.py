@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BulkUpsert:
+
+    @pytest.mark.parametrize('url', ('/api/v1/categories/', '/api/v1/genres/'))
+    def test_01_named_upsert(self, url, admin_client, user_client):
+        admin_client.post(url, data={'name': 'Старое', 'slug': 'old'})
+        data = [
+            {'name': 'Новое', 'slug': 'old'},
+            {'name': 'Фильм', 'slug': 'films'},
+            {'name': 'Книга', 'slug': 'не slug'},
+            {'name': 'Повтор', 'slug': 'films'},
+        ]
+        assert user_client.post(
+            url, data=data, format='json'
+        ).status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.post(url, data=data, format='json')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [result['status'] for result in results] == [200, 201, 400, 400]
+        assert 'slug' in results[2]['errors']
+        assert 'non_field_errors' in results[3]['errors']
+
+        listed = admin_client.get(url).json()['results']
+        assert {item['slug']: item['name'] for item in listed} == {
+            'old': 'Новое', 'films': 'Фильм',
+        }, (
+            f'Проверьте, что POST массива в `{url}` обновляет существующие '
+            'и создаёт новые объекты.'
+        )
+
+    def test_02_titles_upsert(self, admin_client,
+                              django_assert_max_num_queries):
+        from reviews.models import GenreTitle, Title
+
+        for url in ('/api/v1/categories/', '/api/v1/genres/'):
+            admin_client.post(url, data=[
+                {'name': 'Первый', 'slug': 'first'},
+                {'name': 'Второй', 'slug': 'second'},
+            ], format='json')
+        titles = [
+            {
+                'name': f'Произведение {number}', 'year': 2000 + number,
+                'genre': ['first', 'second'][:number % 2 + 1],
+                'category': 'first',
+            }
+            for number in range(50)
+        ]
+        titles.append({
+            'name': 'Ошибка', 'year': 2000, 'genre': ['third'],
+            'category': 'first',
+        })
+        with django_assert_max_num_queries(10):
+            response = admin_client.post(
+                '/api/v1/titles/', data=titles, format='json'
+            )
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [result['status'] for result in results[:50]] == [201] * 50
+        assert 'genre' in results[50]['errors'], (
+            'Проверьте, что несуществующий жанр возвращает ошибку элемента.'
+        )
+        ids = [result['id'] for result in results[:50]]
+        assert sorted(ids) == sorted(Title.objects.values_list('id', flat=True))
+        assert Title.objects.get(id=ids[3]).name == 'Произведение 3'
+        assert GenreTitle.objects.count() == 75
+        assert set(Title.objects.get(id=ids[1]).genre.values_list(
+            'slug', flat=True
+        )) == {'first', 'second'}
+
+        response = admin_client.post('/api/v1/titles/', data=[
+            {'id': ids[1], 'name': 'Новое', 'year': 1999,
+             'genre': ['second'], 'category': 'second'},
+            {'id': 0, 'name': 'Нет', 'year': 1999, 'genre': [],
+             'category': 'first'},
+        ], format='json')
+        results = response.json()['results']
+        assert results[0] == {'status': 200, 'id': ids[1]}
+        assert 'id' in results[1]['errors']
+        title = Title.objects.get(id=ids[1])
+        assert (title.name, title.year, title.category.slug) == (
+            'Новое', 1999, 'second'
+        )
+        assert list(title.genre.values_list('slug', flat=True)) == [
+            'second'
+        ]
+
+    def test_03_not_a_list(self, admin_client):
+        response = admin_client.post(
+            '/api/v1/titles/', data=['x'], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {'detail': 'Ожидается массив объектов.'}
+
+    @pytest.mark.parametrize('url', ('/api/v1/categories/', '/api/v1/genres/'))
+    def test_04_bulk_slug_not_reserved(self, url, admin_client):
+        response = admin_client.post(url, data={'name': 'Х', 'slug': 'bulk'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert admin_client.delete(f'{url}bulk/').status_code == (
+            HTTPStatus.NO_CONTENT
+        ), (
+            f'Проверьте, что объект со slug `bulk` можно удалить через '
+            f'`{url}bulk/`.'
+        )
+
+    def test_05_bulk_insert_ids(self):
+        from django.db import connection
+
+        from api.bulk import bulk_insert
+        from reviews.models import Category
+
+        # Триггер добавляет строку после каждой вставленной, как
+        # параллельная запись между вставкой и чтением id.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TRIGGER bulk_insert_noise AFTER INSERT ON '
+                'reviews_category WHEN new.slug NOT LIKE \'noise-%\' BEGIN '
+                'INSERT INTO reviews_category (name, slug) '
+                'VALUES (\'Шум\', \'noise-\' || new.slug); END'
+            )
+        try:
+            objects = bulk_insert(Category, [
+                Category(name=f'Категория {number}', slug=f'slug-{number}')
+                for number in range(5)
+            ], batch_size=2)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('DROP TRIGGER bulk_insert_noise')
+        assert Category.objects.count() == 10
+        for obj in objects:
+            assert Category.objects.get(pk=obj.pk).slug == obj.slug, (
+                'Проверьте, что bulk_insert присваивает объектам id их '
+                'собственных строк.'
+            )
@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+def read_stream(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Export:
+
+    def test_01_titles_and_reviews(self, admin_client, admin, user_client,
+                                   user, client):
+        from api.views import ExportViewSet
+
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        url = '/api/v1/export/titles/'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+        ExportViewSet.chunk_size = 2
+        try:
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.streaming, (
+                f'Проверьте, что `{url}` отдаёт StreamingHttpResponse.'
+            )
+            assert response['Content-Type'].startswith('application/x-ndjson')
+            rows = [json.loads(line) for line in read_stream(response).split(
+                '\n'
+            ) if line]
+        finally:
+            ExportViewSet.chunk_size = 500
+        assert sorted(row['id'] for row in rows) == sorted(
+            title['id'] for title in titles
+        ), 'Проверьте, что выгрузка содержит все произведения.'
+        first = next(row for row in rows if row['id'] == titles[0]['id'])
+        assert first['rating'] == 5 and first['rating_count'] == 2
+        assert set(first['genre']) == set(titles[0]['genre'])
+        assert first['category'] == titles[0]['category']
+
+        response = admin_client.get(url, {'format': 'csv'})
+        assert response['Content-Type'].startswith('text/csv')
+        table = list(csv.DictReader(io.StringIO(read_stream(response))))
+        assert len(table) == len(titles)
+
+        response = admin_client.get('/api/v1/export/reviews/')
+        rows = [json.loads(line) for line in read_stream(response).split(
+            '\n'
+        ) if line]
+        assert sorted(row['id'] for row in rows) == sorted(
+            review['id'] for review in reviews
+        )
+        assert {row['author'] for row in rows} == {
+            admin.username, user.username
+        }
+
+    @pytest.mark.parametrize('url', (
+        '/api/v1/export/titles/', '/api/v1/export/reviews/',
+    ))
+    def test_02_asgi_body(self, admin_client, admin, user_client, user,
+                          token_admin, url):
+        from asgiref.sync import async_to_sync
+        from asgiref.testing import ApplicationCommunicator
+        from django.core.asgi import get_asgi_application
+        from django.test import override_settings
+
+        from api.views import ExportViewSet
+
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        expected = {
+            '/api/v1/export/titles/': titles,
+            '/api/v1/export/reviews/': reviews,
+        }[url]
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'},
+            'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': url, 'raw_path': url.encode(), 'query_string': b'',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'authorization', f'Bearer {token_admin["access"]}'.encode()),
+            ],
+            'server': ('testserver', 80),
+        }
+
+        async def request():
+            communicator = ApplicationCommunicator(
+                get_asgi_application(), scope
+            )
+            await communicator.send_input({'type': 'http.request'})
+            start = await communicator.receive_output(10)
+            body = b''
+            while True:
+                message = await communicator.receive_output(10)
+                body += message.get('body', b'')
+                if not message.get('more_body'):
+                    break
+            await communicator.wait(10)
+            return start, body
+
+        ExportViewSet.chunk_size = 2
+        ExportViewSet.spool_max_size = 64
+        try:
+            with override_settings(ASYNC_READ_VIEWS=True):
+                start, body = async_to_sync(request)()
+        finally:
+            ExportViewSet.chunk_size = 500
+            ExportViewSet.spool_max_size = 1024 * 1024
+        assert start['status'] == HTTPStatus.OK
+        headers = dict(start['headers'])
+        assert headers[b'Content-Type'].startswith(b'application/x-ndjson')
+        assert headers[b'Content-Disposition'].startswith(b'attachment')
+        rows = [json.loads(line) for line in body.decode().split('\n')
+                if line]
+        assert sorted(row['id'] for row in rows) == sorted(
+            item['id'] for item in expected
+        ), (
+            f'Проверьте, что под ASGI `{url}` отдаёт выгрузку целиком.'
+        )
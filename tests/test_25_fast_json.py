@@ -0,0 +1,87 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.http import QueryDict
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_reviews
+
+DATA = {
+    'count': 2,
+    'next': None,
+    'results': [
+        {
+            'id': 1,
+            'rating': None,
+            'name': 'Терминатор ',
+            'pub_date': datetime.datetime(
+                2023, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+            ),
+            'year': datetime.date(1984, 10, 26),
+            'score': Decimal('7.5'),
+            'detail': gettext_lazy('Not found.'),
+            'genre': ('drama', 'action'),
+        },
+    ],
+    1: 'int key',
+}
+
+
+class Test25FastJSON:
+
+    def test_01_renderer_matches_stdlib(self):
+        from api.renderers import FastJSONRenderer
+
+        expected = JSONRenderer().render(DATA)
+        assert FastJSONRenderer().render(DATA) == expected, (
+            'Проверьте, что FastJSONRenderer отдаёт те же байты, что и '
+            'JSONRenderer.'
+        )
+        assert b'\\u2028' in expected
+        assert FastJSONRenderer().render(
+            DATA, 'application/json; indent=4'
+        ) == JSONRenderer().render(DATA, 'application/json; indent=4')
+        assert FastJSONRenderer().render(None) == b''
+        query = QueryDict('username=a&username=b&email=c')
+        assert FastJSONRenderer().render(query) == (
+            JSONRenderer().render(query)
+        )
+
+    def test_02_stdlib_fallback(self, monkeypatch):
+        from api import parsers, renderers
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+        assert renderers.FastJSONRenderer().render(DATA) == (
+            JSONRenderer().render(DATA)
+        )
+        assert parsers.FastJSONParser().parse(
+            io.BytesIO('{"a": [1, "б"]}'.encode())
+        ) == {'a': [1, 'б']}
+
+    def test_03_parser(self):
+        from api.parsers import FastJSONParser
+
+        body = '{"text": "Отзыв", "score": 5, "genre": ["a"]}'.encode()
+        assert FastJSONParser().parse(io.BytesIO(body)) == (
+            JSONParser().parse(io.BytesIO(body))
+        )
+        for invalid in (b'{"a": ', b'{"a": NaN}'):
+            with pytest.raises(ParseError):
+                FastJSONParser().parse(io.BytesIO(invalid))
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_benchmark_command(self, admin_client, admin):
+        create_reviews(admin_client, {admin: admin_client})
+        out = io.StringIO()
+        call_command('benchmark_json', iterations=1, page_size=[5], stdout=out)
+        lines = out.getvalue().splitlines()
+        assert [line.split()[0] for line in lines[1:]] == [
+            'titles[5]', 'reviews[5]', 'comments[5]',
+        ], 'Проверьте, что benchmark_json сравнивает все типичные страницы.'
@@ -0,0 +1,117 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments
+
+
+def get_both(client, settings, url):
+    """Ответы на `url` из строк .values() и из ModelSerializer."""
+    settings.VALUES_SERIALIZERS = True
+    fast = client.get(url)
+    settings.VALUES_SERIALIZERS = False
+    slow = client.get(url)
+    return fast, slow
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ValuesSerializers:
+
+    def create_data(self, admin_client, admin, user_client, user):
+        from reviews.models import Title
+
+        comments, reviews, titles = create_comments(admin_client, {
+            admin: admin_client, user: user_client,
+        })
+        Title.objects.create(name='Без категории и жанров', year=2000)
+        return comments, reviews, titles
+
+    def test_01_responses_are_identical(self, admin_client, admin,
+                                        user_client, user, settings):
+        comments, reviews, titles = self.create_data(
+            admin_client, admin, user_client, user
+        )
+        title_id = titles[0]['id']
+        review_url = f'/api/v1/titles/{title_id}/reviews/'
+        comment_url = f'{review_url}{reviews[0]["id"]}/comments/'
+        urls = (
+            '/api/v1/titles/',
+            '/api/v1/titles/?page=2&page_size=2',
+            '/api/v1/titles/?page_size=2&pagination=cursor',
+            '/api/v1/titles/?genre=drama',
+            '/api/v1/titles/?search=терминатор&pagination=cursor',
+            f'/api/v1/titles/{title_id}/',
+            review_url,
+            f'{review_url}?pagination=cursor&page_size=1',
+            f'{review_url}{reviews[1]["id"]}/',
+            comment_url,
+            f'{comment_url}{comments[0]["id"]}/',
+        )
+        for url in urls:
+            fast, slow = get_both(user_client, settings, url)
+            assert fast.status_code == slow.status_code == 200, url
+            assert fast.content == slow.content, (
+                f'Проверьте, что ответ на `{url}` из строк .values() '
+                'совпадает с ответом ModelSerializer байт в байт.'
+            )
+
+    def test_02_cursor_pages_are_identical(self, admin_client, admin,
+                                           user_client, user, settings):
+        self.create_data(admin_client, admin, user_client, user)
+        url = '/api/v1/titles/?page_size=1&pagination=cursor'
+        pages = 0
+        while url:
+            fast, slow = get_both(user_client, settings, url)
+            assert fast.content == slow.content, (
+                'Проверьте, что курсорные ссылки из строк .values() '
+                'совпадают со ссылками ModelSerializer.'
+            )
+            url = fast.json()['next']
+            pages += 1
+        assert pages == 3
+
+    def test_03_not_found(self, admin_client, admin, user_client, user,
+                          settings):
+        self.create_data(admin_client, admin, user_client, user)
+        for url in ('/api/v1/titles/999/', '/api/v1/titles/1/reviews/999/'):
+            fast, slow = get_both(user_client, settings, url)
+            assert fast.status_code == slow.status_code == 404, url
+
+    def test_04_serializers_match(self, admin_client, admin, user_client,
+                                  user):
+        from api.serializers import (CommentSerializer,
+                                     CommentValuesSerializer,
+                                     ReviewSerializer, ReviewValuesSerializer,
+                                     TitleGetSerializer,
+                                     TitleValuesSerializer)
+        from reviews.models import Comment, Review, Title
+
+        self.create_data(admin_client, admin, user_client, user)
+        for model_serializer, values_serializer, queryset in (
+            (TitleGetSerializer, TitleValuesSerializer,
+             Title.objects.for_read()),
+            (ReviewSerializer, ReviewValuesSerializer,
+             Review.objects.select_related('author')),
+            (CommentSerializer, CommentValuesSerializer,
+             Comment.objects.select_related('author')),
+        ):
+            expected = model_serializer(queryset, many=True).data
+            assert values_serializer(
+                values_serializer.get_values(queryset), many=True
+            ).data == expected, (
+                f'Проверьте, что {values_serializer.__name__} совпадает с '
+                f'{model_serializer.__name__}.'
+            )
+
+    def test_05_benchmark_command(self, admin_client, admin, user_client,
+                                  user):
+        self.create_data(admin_client, admin, user_client, user)
+        out = io.StringIO()
+        call_command(
+            'benchmark_serializers', iterations=1, page_size=[5], stdout=out
+        )
+        lines = out.getvalue().splitlines()
+        assert [line.split()[0] for line in lines[1:]] == [
+            'titles[5]', 'reviews[5]', 'comments[5]',
+        ], 'Проверьте, что benchmark_serializers сравнивает все страницы.'
@@ -0,0 +1,122 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+def get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, [query['sql'] for query in context.captured_queries]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27SparseFields:
+
+    @pytest.mark.parametrize('values_serializers', (True, False))
+    def test_01_title_fields(self, admin_client, admin, client,
+                             settings, values_serializers):
+        settings.VALUES_SERIALIZERS = values_serializers
+        create_comments(admin_client, {admin: admin_client})
+
+        response, queries = get_with_queries(
+            client, '/api/v1/titles/?fields=id,name,year'
+        )
+        assert response.status_code == HTTPStatus.OK
+        for title in response.json()['results']:
+            assert list(title) == ['id', 'name', 'year'], (
+                'Проверьте, что `?fields=` оставляет в ответе только '
+                'выбранные поля в исходном порядке.'
+            )
+        assert len(queries) == 2, (
+            'Проверьте, что без поля `genre` жанры не запрашиваются.'
+        )
+        assert not any(
+            'description' in sql or 'reviews_category' in sql
+            for sql in queries
+        ), (
+            'Проверьте, что невыбранные колонки и связи не читаются из БД.'
+        )
+
+    @pytest.mark.parametrize('values_serializers', (True, False))
+    def test_02_title_exclude(self, admin_client, admin, client,
+                              settings, values_serializers):
+        settings.VALUES_SERIALIZERS = values_serializers
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+
+        response, queries = get_with_queries(
+            client,
+            f'/api/v1/titles/{titles[0]["id"]}/?exclude=description,genre',
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {
+            'id': titles[0]['id'],
+            'rating': 5,
+            'name': titles[0]['name'],
+            'year': titles[0]['year'],
+            'category': {'name': 'Фильм', 'slug': 'films'},
+        }, 'Проверьте, что `?exclude=` убирает поля из ответа.'
+        assert len(queries) == 1
+        assert 'description' not in queries[0]
+
+    @pytest.mark.parametrize('values_serializers', (True, False))
+    def test_03_reviews_and_comments(self, admin_client, admin, client,
+                                     settings, values_serializers):
+        settings.VALUES_SERIALIZERS = values_serializers
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response, queries = get_with_queries(
+            client, f'{url}?exclude=text&pagination=cursor'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert list(response.json()['results'][0]) == [
+            'id', 'author', 'title', 'score', 'pub_date',
+        ]
+        assert not any('"text"' in sql for sql in queries), (
+            'Проверьте, что текст отзывов не читается без поля `text`.'
+        )
+
+        response, queries = get_with_queries(
+            client,
+            f'{url}{reviews[0]["id"]}/comments/?fields=id,text',
+        )
+        assert response.json()['results'] == [
+            {'id': comment['id'], 'text': comment['text']}
+            for comment in admin_client.get(
+                f'{url}{reviews[0]["id"]}/comments/'
+            ).json()['results']
+        ]
+        assert not any('users_user' in sql for sql in queries), (
+            'Проверьте, что без поля `author` пользователи не '
+            'присоединяются к запросу.'
+        )
+
+    def test_04_invalid_fields(self, admin_client, admin, client):
+        create_comments(admin_client, {admin: admin_client})
+        for query in ('fields=id,secret', 'exclude=password',
+                      'fields=id&exclude=id'):
+            response = client.get(f'/api/v1/titles/?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `?{query}` возвращает ошибку 400.'
+            )
+
+    def test_05_same_output(self, admin_client, admin, client,
+                            settings):
+        create_comments(admin_client, {admin: admin_client})
+        for url in (
+            '/api/v1/titles/?fields=genre,name&pagination=cursor',
+            '/api/v1/titles/?exclude=category',
+            '/api/v1/titles/?fields=category',
+        ):
+            settings.VALUES_SERIALIZERS = True
+            fast = client.get(url)
+            settings.VALUES_SERIALIZERS = False
+            assert fast.content == client.get(url).content, (
+                f'Проверьте, что ответ на `{url}` не зависит от '
+                'VALUES_SERIALIZERS.'
+            )
@@ -0,0 +1,163 @@
+import threading
+import time
+
+import pytest
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+from django.db.utils import load_backend
+
+
+def make_connection(path, profile, alias='stress', **options):
+    settings_dict = {
+        'ATOMIC_REQUESTS': False,
+        'AUTOCOMMIT': True,
+        'CONN_MAX_AGE': 0,
+        'TIME_ZONE': None,
+        'USER': '',
+        'PASSWORD': '',
+        'HOST': '',
+        'PORT': '',
+        **settings.DATABASE_PROFILES[profile],
+        'NAME': str(path),
+    }
+    settings_dict['OPTIONS'] = {**settings_dict.get('OPTIONS', {}), **options}
+    backend = load_backend(settings_dict['ENGINE'])
+    return backend.DatabaseWrapper(settings_dict, alias)
+
+
+def fetch(connection, sql):
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchone()[0]
+
+
+class Test28SQLiteProfile:
+
+    @pytest.fixture(autouse=True)
+    def own_databases(self, django_db_blocker):
+        """Тесты работают с собственными файлами БД, а не с тестовой."""
+        with django_db_blocker.unblock():
+            yield
+
+    def test_01_pragmas(self, tmp_path):
+        profile = settings.DATABASE_PROFILES['production']
+        assert profile['CONN_MAX_AGE'], (
+            'Проверьте, что профиль production переиспользует соединения.'
+        )
+        connection = make_connection(tmp_path / 'db.sqlite3', 'production')
+        try:
+            assert fetch(connection, 'PRAGMA journal_mode') == 'wal'
+            assert fetch(connection, 'PRAGMA synchronous') == 1
+            assert fetch(connection, 'PRAGMA temp_store') == 2
+            assert fetch(connection, 'PRAGMA cache_size') == -64 * 1024
+            assert fetch(connection, 'PRAGMA mmap_size') == 256 * 1024 * 1024
+            assert fetch(connection, 'PRAGMA busy_timeout') == 20000
+        finally:
+            connection.close()
+
+    @pytest.mark.parametrize('profile, blocked', (
+        ('development', True),
+        ('production', False),
+    ))
+    def test_02_reader_does_not_block_writer(self, tmp_path, profile,
+                                             blocked):
+        path = tmp_path / 'db.sqlite3'
+        reader = make_connection(path, profile, timeout=0.2)
+        writer = make_connection(path, profile, timeout=0.2)
+        try:
+            with writer.cursor() as cursor:
+                cursor.execute('CREATE TABLE item (id INTEGER PRIMARY KEY)')
+            with reader.cursor() as cursor:
+                cursor.execute('BEGIN')
+                cursor.execute('SELECT COUNT(*) FROM item')
+                cursor.fetchone()
+            try:
+                with writer.cursor() as cursor:
+                    cursor.execute('INSERT INTO item DEFAULT VALUES')
+            except OperationalError:
+                assert blocked, (
+                    'Проверьте, что в профиле production открытое чтение '
+                    'не блокирует запись.'
+                )
+            else:
+                assert not blocked
+                assert fetch(reader, 'SELECT COUNT(*) FROM item') == 0, (
+                    'Проверьте, что читатель видит свой снимок данных.'
+                )
+        finally:
+            reader.close()
+            writer.close()
+
+    def test_03_concurrent_reads_and_writes(self, tmp_path):
+        path = tmp_path / 'db.sqlite3'
+        setup = make_connection(path, 'production')
+        with setup.cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE item (id INTEGER PRIMARY KEY, number INTEGER)'
+            )
+        setup.close()
+        writers, transactions = 8, 25
+        errors = []
+        read_times = []
+        writing = threading.Event()
+
+        def write():
+            connections['stress'] = make_connection(path, 'production')
+            try:
+                for _ in range(transactions):
+                    # Чтение и запись в одной транзакции, как при создании
+                    # отзыва: с BEGIN DEFERRED такие транзакции падают.
+                    with transaction.atomic(using='stress'):
+                        number = fetch(
+                            connections['stress'],
+                            'SELECT COALESCE(MAX(number), 0) FROM item',
+                        )
+                        with connections['stress'].cursor() as cursor:
+                            cursor.execute(
+                                'INSERT INTO item (number) VALUES (%s)',
+                                [number + 1],
+                            )
+                        writing.set()
+                        time.sleep(0.001)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections['stress'].close()
+
+        def read():
+            connection = make_connection(path, 'production', alias='read')
+            writing.wait()
+            try:
+                for _ in range(50):
+                    start = time.perf_counter()
+                    fetch(connection, 'SELECT COUNT(*) FROM item')
+                    read_times.append(time.perf_counter() - start)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=write) for _ in range(writers)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors, (
+            'Проверьте, что параллельные чтение и запись в профиле '
+            f'production не приводят к ошибкам: {errors[:3]}'
+        )
+        connection = make_connection(path, 'production')
+        try:
+            assert fetch(connection, 'SELECT COUNT(*) FROM item') == (
+                writers * transactions
+            )
+            assert fetch(connection, 'SELECT MAX(number) FROM item') == (
+                writers * transactions
+            ), 'Проверьте, что транзакции записи не теряют обновления.'
+        finally:
+            connection.close()
+        assert max(read_times) < 0.5, (
+            'Проверьте, что чтение не ждёт завершения транзакций записи.'
+        )
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.test_09_keyset_pagination import walk
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29TitleOrdering:
+
+    def create_titles(self):
+        from reviews.models import Genre, Title
+
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        ratings = (7, None, 9, 7, 3, None, 9)
+        titles = []
+        for idx, rating in enumerate(ratings):
+            title = Title.objects.create(
+                name=f'title {6 - idx}', year=1990 + idx % 3, rating=rating,
+                rating_count=idx % 4,
+            )
+            if idx % 2 == 0:
+                title.genre.add(drama)
+            titles.append(title)
+        return titles
+
+    def get_ids(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.parametrize('param, ordering', (
+        ('-rating', ('-rating', '-id')),
+        ('rating', ('rating', 'id')),
+        ('-review_count', ('-rating_count', '-id')),
+        ('year', ('year', 'id')),
+        ('-year,name', ('-year', 'name', 'id')),
+        ('name', ('name', 'id')),
+    ))
+    def test_01_ordering(self, client, param, ordering):
+        from reviews.models import Title
+
+        self.create_titles()
+        expected = list(
+            Title.objects.order_by(*ordering).values_list('id', flat=True)
+        )
+        assert self.get_ids(
+            client, f'/api/v1/titles/?ordering={param}&page_size=10'
+        ) == expected, (
+            f'Проверьте, что `?ordering={param}` сортирует произведения по '
+            f'{", ".join(ordering)}.'
+        )
+        ids, _ = walk(
+            client,
+            f'/api/v1/titles/?ordering={param}&pagination=cursor&page_size=2',
+        )
+        assert ids == expected, (
+            f'Проверьте, что курсорная пагинация с `?ordering={param}` '
+            'отдаёт все произведения в том же порядке.'
+        )
+
+    def test_02_top_rated_in_genre(self, client):
+        titles = self.create_titles()
+        ids = self.get_ids(
+            client, '/api/v1/titles/?genre=drama&ordering=-rating'
+        )
+        assert ids == [titles[6].id, titles[2].id, titles[0].id,
+                       titles[4].id], (
+            'Проверьте, что `?genre=...&ordering=-rating` отдаёт '
+            'произведения жанра от лучших к худшим, без оценок — в конце.'
+        )
+
+    def test_03_invalid_ordering(self, client):
+        for param in ('rating_sum', 'description', '-genre'):
+            response = client.get(f'/api/v1/titles/?ordering={param}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `?ordering={param}` возвращает ошибку 400.'
+            )
+
+    def test_04_ordering_indexes(self):
+        from reviews.models import Title
+
+        indexes = {
+            tuple(index.fields) for index in Title._meta.indexes
+        }
+        for fields in (
+            ('-rating', '-id'),
+            ('category', '-rating', '-id'),
+            ('-rating_count', '-id'),
+            ('-year', '-id'),
+            ('name', 'id'),
+        ):
+            assert fields in indexes, (
+                f'Проверьте, что у произведений есть индекс {fields} для '
+                'сортировки.'
+            )
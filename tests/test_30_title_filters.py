@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30TitleFilters:
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Genre, Title
+
+        genres = {
+            slug: Genre.objects.create(name=slug, slug=slug)
+            for slug in ('drama', 'comedy', 'horror')
+        }
+        categories = {
+            slug: Category.objects.create(name=slug, slug=slug)
+            for slug in ('films', 'books', 'music')
+        }
+        rows = (
+            ('A', 1980, 9, 'films', ('drama', 'comedy')),
+            ('B', 1990, 5, 'films', ('drama',)),
+            ('C', 2000, None, 'books', ('comedy', 'horror')),
+            ('D', 2010, 7, 'music', ('drama', 'comedy', 'horror')),
+            ('E', 2020, 2, None, ()),
+        )
+        titles = {}
+        for name, year, rating, category, genre in rows:
+            title = Title.objects.create(
+                name=name, year=year, rating=rating,
+                category=categories.get(category),
+            )
+            title.genre.set([genres[slug] for slug in genre])
+            titles[name] = title
+        return titles
+
+    def get_names(self, client, query):
+        url = f'/api/v1/titles/?{query}&page_size=20'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, url
+        data = response.json()
+        names = sorted(title['name'] for title in data['results'])
+        assert data['count'] == len(names), (
+            f'Проверьте, что фильтр `{query}` не дублирует произведения.'
+        )
+        return names, [query['sql'] for query in context.captured_queries]
+
+    @pytest.mark.parametrize('query, expected', (
+        ('year_min=1990', ['B', 'C', 'D', 'E']),
+        ('year_max=2000', ['A', 'B', 'C']),
+        ('year_min=1990&year_max=2010', ['B', 'C', 'D']),
+        ('rating_min=5', ['A', 'B', 'D']),
+        ('rating_max=5', ['B', 'E']),
+        ('rating_min=3&rating_max=8', ['B', 'D']),
+        ('genre__in=drama,comedy', ['A', 'B', 'C', 'D']),
+        ('genre__in=horror', ['C', 'D']),
+        ('genre__all=drama,comedy', ['A', 'D']),
+        ('genre__all=drama,comedy,horror', ['D']),
+        ('genre__all=drama,drama', ['A', 'B', 'D']),
+        ('category__in=films,music', ['A', 'B', 'D']),
+        ('category__in=books,unknown', ['C']),
+        ('genre__in=comedy&category__in=films,books&year_min=1990', ['C']),
+    ))
+    def test_01_filters(self, client, titles, query, expected):
+        names, _ = self.get_names(client, query)
+        assert names == expected, (
+            f'Проверьте, что фильтр `{query}` отбирает произведения '
+            f'{", ".join(expected)}.'
+        )
+
+    def test_02_exists_instead_of_join(self, client, titles):
+        for query in ('genre__in=drama,comedy', 'genre__all=drama,comedy',
+                      'category__in=films,music'):
+            _, queries = self.get_names(client, query)
+            for sql in queries:
+                if 'FROM "reviews_title"' not in sql:
+                    continue
+                assert 'EXISTS' in sql and 'INNER JOIN' not in (
+                    sql.split('EXISTS')[0]
+                ), (
+                    f'Проверьте, что фильтр `{query}` выполняется через '
+                    'EXISTS, а не через JOIN.'
+                )
+
+    def test_03_invalid_values(self, client, titles):
+        for query in ('year_min=abc', 'rating_max=x'):
+            response = client.get(f'/api/v1/titles/?{query}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `?{query}` возвращает ошибку 400.'
+            )
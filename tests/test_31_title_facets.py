@@ -0,0 +1,126 @@
+from http import HTTPStatus
+
+import pytest
+
+URL = '/api/v1/titles/facets/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31TitleFacets:
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Genre, Title
+
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        films = Category.objects.create(name='Фильмы', slug='films')
+        books = Category.objects.create(name='Книги', slug='books')
+        rows = (
+            (1990, films, (drama, comedy)),
+            (1990, films, (drama,)),
+            (2000, books, (drama,)),
+            (2010, None, (comedy,)),
+        )
+        for year, category, genres in rows:
+            title = Title.objects.create(
+                name='Произведение', year=year, category=category
+            )
+            title.genre.set(genres)
+
+    def test_01_counts(self, client, titles):
+        response = client.get(URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{URL}` возвращает ответ со '
+            'статусом 200.'
+        )
+        assert response.json() == {
+            'genre': [
+                {'slug': 'drama', 'name': 'Драма', 'count': 3},
+                {'slug': 'comedy', 'name': 'Комедия', 'count': 2},
+            ],
+            'category': [
+                {'slug': 'films', 'name': 'Фильмы', 'count': 2},
+                {'slug': 'books', 'name': 'Книги', 'count': 1},
+            ],
+            'year': [
+                {'year': 2010, 'count': 1},
+                {'year': 2000, 'count': 1},
+                {'year': 1990, 'count': 2},
+            ],
+        }, 'Проверьте, что фасеты считают произведения по срезам.'
+
+    def test_02_counts_follow_filters(self, client, titles):
+        data = client.get(f'{URL}?genre=drama&year_min=1995').json()
+        assert data == {
+            'genre': [{'slug': 'drama', 'name': 'Драма', 'count': 1}],
+            'category': [{'slug': 'books', 'name': 'Книги', 'count': 1}],
+            'year': [{'year': 2000, 'count': 1}],
+        }, 'Проверьте, что фасеты учитывают фильтры TitleFilter.'
+        response = client.get(f'{URL}?year_min=abc')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_cached_until_title_write(self, client, admin_client, titles,
+                                         django_assert_num_queries):
+        with django_assert_num_queries(3):
+            first = client.get(f'{URL}?category=films')
+        with django_assert_num_queries(0):
+            second = client.get(f'{URL}?category=films&ordering=-rating')
+        assert first.json() == second.json(), (
+            'Проверьте, что фасеты берутся из кеша и не пересчитываются.'
+        )
+        assert client.get(
+            URL, HTTP_IF_NONE_MATCH=client.get(URL)['ETag']
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Новое', 'year': 1990, 'genre': ['comedy'],
+            'category': 'films',
+        })
+        assert response.status_code == HTTPStatus.CREATED
+        data = client.get(f'{URL}?category=films').json()
+        assert data['category'] == [
+            {'slug': 'films', 'name': 'Фильмы', 'count': 3},
+        ], 'Проверьте, что запись произведения сбрасывает кеш фасетов.'
+        assert data['genre'] == [
+            {'slug': 'drama', 'name': 'Драма', 'count': 2},
+            {'slug': 'comedy', 'name': 'Комедия', 'count': 2},
+        ]
+
+    def test_04_reviews_only_reset_rating_facets(self, client, user_client,
+                                                 titles,
+                                                 django_assert_num_queries):
+        from reviews.models import Title
+
+        title = Title.objects.get(year=2000)
+        rated_url = f'{URL}?rating_min=1'
+        client.get(URL)
+        assert client.get(rated_url).json()['year'] == []
+
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Текст', 'score': 8},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        with django_assert_num_queries(0):
+            client.get(URL)
+        assert client.get(rated_url).json()['year'] == [
+            {'year': 2000, 'count': 1},
+        ], (
+            'Проверьте, что отзыв сбрасывает кеш фасетов только для '
+            'запросов с фильтром по рейтингу.'
+        )
+
+    def test_05_no_cache_without_shared_versions(self, client, settings,
+                                                 titles):
+        from reviews.models import Title
+
+        settings.API_SINGLE_PROCESS = False
+        assert client.get(URL).json()['year'][0]['year'] == 2010
+        Title.objects.create(name='Новое', year=2020)
+        assert client.get(URL).json()['year'][0] == {
+            'year': 2020, 'count': 1
+        }, (
+            'Проверьте, что без общего для процессов кеша фасеты не '
+            'кешируются.'
+        )